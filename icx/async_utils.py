@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from icx.custom_error import ResponseIsInvalid
+from icx.utils import create_jsonrpc_request_content, get_payload_of_json_rpc_get_balance
+
+
+async def post(url, payload, transport):
+    """ Send payload to url through the async transport.
+
+    :param url: Api url. type(str)
+    :param payload: Jsonrpc request content. type(dict)
+    :param transport: Instance of AsyncHttpTransport class.
+
+    :return: response content. type(dict)
+    """
+    return await transport.post(url, payload)
+
+
+async def get_balance(address, url, transport):
+    """ Get balance of the address indicated by address.
+
+    :param address: icx account address starting with 'hx'
+    :param url: api target url
+    :param transport: Instance of AsyncHttpTransport class.
+
+    :return: icx
+    """
+    url = f'{url}v2'
+
+    payload = get_payload_of_json_rpc_get_balance(address, url)
+    content = await post(url, payload, transport)
+    try:
+        hex_balance = content['result']['response']
+    except (KeyError, TypeError):
+        raise ResponseIsInvalid
+    return int(hex_balance, 16)
+
+
+async def get_block_by_hash(hash, url, transport):
+    """ Get block information by hash.
+
+    :param hash: Using hash values with electronic signatures. 64 character. hexadecimal.
+    :param url: api target url
+    :param transport: Instance of AsyncHttpTransport class.
+
+    :return: response result(json)
+    """
+    url = f'{url}v2'
+
+    payload = create_jsonrpc_request_content(0, 'icx_getBlockByHash', {'hash': hash})
+    return await post(url, payload, transport)
+
+
+async def get_block_by_height(height, url, transport):
+    """ Get block information by height.
+
+    :param height: block's height
+    :param url: api target url
+    :param transport: Instance of AsyncHttpTransport class.
+
+    :return: response result(json)
+    """
+    url = f'{url}v2'
+
+    payload = create_jsonrpc_request_content(0, 'icx_getBlockByHeight', {'height': height})
+    return await post(url, payload, transport)
+
+
+async def get_last_block(url, transport):
+    """ Get last block information.
+
+    :param url: api target url
+    :param transport: Instance of AsyncHttpTransport class.
+
+    :return: response result(json)
+    """
+    url = f'{url}v2'
+
+    payload = create_jsonrpc_request_content(0, 'icx_getLastBlock', {})
+    return await post(url, payload, transport)
@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import os
+from collections import deque
+from functools import partial
+from multiprocessing import Pool
+from icx.codec import dumps
+from eth_keyfile import decode_keyfile_json
+from icx.custom_error import PasswordIsNotAcceptable, FilePathIsWrong, PasswordIsWrong, AddressIsWrong, \
+    KeystoreIsNotUnlocked, KeystoreIsNotReencrypted
+from icx.kdf import KdfProfile, get_kdf_profile
+from icx.signer import IcxSigner
+from icx.utils import sign_params, verify, validate_password, make_key_store_content, store_wallet_atomically, \
+    load_key_store_file, validate_key_store_content
+
+# The number of items sent to a worker process at once.
+CHUNK_SIZE = 256
+
+# Results of reencrypt_keystores().
+REENCRYPTED = 'reencrypted'
+ALREADY_REENCRYPTED = 'already_reencrypted'
+
+_private_key_bytes = None
+_method = None
+
+
+def _map_chunk(function, chunk):
+    return [function(item) for item in chunk]
+
+
+def _imap_bounded(pool, function, iterable, chunk_size, read_ahead):
+    """ Like pool.imap() but submit at most read_ahead chunks ahead of the result the caller is consuming,
+    so neither the input nor the results are read or kept more than that in advance.
+    """
+    items = iter(iterable)
+    chunks = iter(lambda: list(itertools.islice(items, chunk_size)), [])
+    pending = deque(pool.apply_async(_map_chunk, (function, chunk))
+                    for chunk in itertools.islice(chunks, max(read_ahead, 1)))
+    while pending:
+        results = pending.popleft().get()
+        for chunk in itertools.islice(chunks, 1):
+            pending.append(pool.apply_async(_map_chunk, (function, chunk)))
+        yield from results
+
+
+def _get_read_ahead(processes, read_ahead):
+    return read_ahead if read_ahead is not None else (processes or os.cpu_count() or 1) * 2
+
+
+def _init_signing_worker(private_key_bytes, method):
+    global _private_key_bytes, _method
+    _private_key_bytes = private_key_bytes
+    _method = method
+
+
+def _sign_in_worker(params):
+    return sign_params(_method, dict(params), _private_key_bytes)
+
+
+def sign_many(private_key_bytes, params_list, method='icx_sendTransaction', processes=None, chunk_size=CHUNK_SIZE,
+              read_ahead=None):
+    """ Sign many transactions of one private key across worker processes.
+
+    The private key is sent to each worker once, and the signed params are yielded in the order of
+    params_list as soon as they are ready. At most read_ahead chunks are taken from params_list ahead of
+    the params the caller is consuming, so very large batches don't have to fit in memory.
+
+    :param private_key_bytes: Private key of user's wallet. type(bytes)
+    :param params_list: Iterable of params made by make_unsigned_params().
+    :param method: Method type. type(str)
+    :param processes: The number of worker processes. os.cpu_count() by default. 1 signs in this process.
+    :param chunk_size: The number of params sent to a worker at once. type(int)
+    :param read_ahead: The number of chunks sent to the workers in advance. processes * 2 by default. type(int)
+
+    :return: generator of params with tx_hash and signature.
+    """
+    if processes == 1:
+        for params in params_list:
+            yield sign_params(method, dict(params), private_key_bytes)
+        return
+
+    with Pool(processes, initializer=_init_signing_worker, initargs=(private_key_bytes, method)) as pool:
+        yield from _imap_bounded(pool, _sign_in_worker, params_list, chunk_size,
+                                 _get_read_ahead(processes, read_ahead))
+
+
+def verify_many(txs, processes=None, chunk_size=CHUNK_SIZE, read_ahead=None):
+    """ Verify many transactions across worker processes. See icx.utils.verify().
+
+    At most read_ahead chunks are taken from txs ahead of the result the caller is consuming, so it can verify
+    the transactions of blocks while they are fetched.
+
+    :param txs: Iterable of transactions. e.g. confirmed_transaction_list of blocks.
+    :param processes: The number of worker processes. os.cpu_count() by default. 1 verifies in this process.
+    :param chunk_size: The number of transactions sent to a worker at once. type(int)
+    :param read_ahead: The number of chunks sent to the workers in advance. processes * 2 by default. type(int)
+
+    :return: generator of bool in the order of txs.
+    """
+    if processes == 1:
+        yield from map(verify, txs)
+        return
+
+    with Pool(processes) as pool:
+        yield from _imap_bounded(pool, verify, txs, chunk_size, _get_read_ahead(processes, read_ahead))
+
+
+def _derive_address(private_key_bytes, compact):
+    # A new signer rather than get_signer() not to fill the cache with keys used once.
+    address = IcxSigner.from_bytes(bytes(private_key_bytes)).address
+    return address if compact else f'hx{address.hex()}'
+
+
+def derive_addresses(private_keys, compact=False, processes=None, chunk_size=CHUNK_SIZE, read_ahead=None):
+    """ Derive the addresses of many private keys across worker processes.
+
+    At most read_ahead chunks of keys are taken from private_keys ahead of the address the caller is consuming,
+    so memory doesn't grow with the number of keys.
+
+    :param private_keys: Iterable of 32 bytes private keys, or bytes of private keys put one after another.
+    :param compact: Yield 20 bytes addresses instead of strings starting with 'hx'. type(bool)
+    :param processes: The number of worker processes. os.cpu_count() by default. 1 derives in this process.
+    :param chunk_size: The number of keys sent to a worker at once. type(int)
+    :param read_ahead: The number of chunks sent to the workers in advance. processes * 2 by default. type(int)
+
+    :return: generator of addresses in the order of private_keys.
+    """
+    if isinstance(private_keys, (bytes, bytearray, memoryview)):
+        keys = memoryview(private_keys)
+        if len(keys) % 32 != 0:
+            raise ValueError("The length of private keys must be a multiple of 32 bytes.")
+        private_keys = (keys[i:i + 32].tobytes() for i in range(0, len(keys), 32))
+
+    derive = partial(_derive_address, compact=compact)
+    if processes == 1:
+        yield from map(derive, private_keys)
+        return
+
+    with Pool(processes) as pool:
+        yield from _imap_bounded(pool, derive, private_keys, chunk_size, _get_read_ahead(processes, read_ahead))
+
+
+def _create_keystore_file(_, directory, password, kdf_profile):
+    key_store_contents = make_key_store_content(password, kdf_profile)
+    address = key_store_contents['address']
+    file_path = os.path.join(directory, f'{address}.json')
+    store_wallet_atomically(file_path, dumps(key_store_contents))
+    return address, file_path
+
+
+def create_keystore_files(directory, count, password, processes=None, kdf_profile=None, manifest_path=None,
+                          chunk_size=1):
+    """ Create many wallets and their keystore files across worker processes.
+
+    Each file is named after its address and written atomically, so an interrupted run leaves only complete files.
+    The addresses are yielded, and appended to the manifest, as soon as their files are written. The private keys
+    never leave the keystore files.
+
+    :param directory: Directory for the keystore files. type(str)
+    :param count: The number of wallets to create. type(int)
+    :param password: Password including alphabet character, number, and special character.
+    :param processes: The number of worker processes. os.cpu_count() by default. 1 creates in this process.
+    :param kdf_profile: Instance of KdfProfile class. DEFAULT_KDF_PROFILE when None.
+    :param manifest_path: File to which a line of address and file path is appended per wallet. type(str)
+    :param chunk_size: The number of wallets given to a worker at once. type(int)
+
+    :return: generator of tuples of address and file path in the order of completion.
+    """
+    if not validate_password(password):
+        raise PasswordIsNotAcceptable
+    if not os.path.isdir(directory):
+        raise FilePathIsWrong
+
+    create = partial(_create_keystore_file, directory=directory, password=password,
+                     kdf_profile=get_kdf_profile(kdf_profile))
+    manifest = open(manifest_path, 'a', encoding='utf-8') if manifest_path else None
+    try:
+        if processes == 1:
+            yield from _write_manifest(map(create, range(count)), manifest)
+        else:
+            with Pool(processes) as pool:
+                yield from _write_manifest(pool.imap_unordered(create, range(count), chunk_size), manifest)
+    finally:
+        if manifest is not None:
+            manifest.close()
+
+
+def _write_manifest(results, manifest):
+    for address, file_path in results:
+        if manifest is not None:
+            manifest.write(f'{address}\t{file_path}\n')
+            manifest.flush()
+        yield address, file_path
+
+
+def _unlock_keystore(keystore_and_password):
+    keystore, password = keystore_and_password
+    # Results have the address when it is known, or the file path.
+    source = keystore.get('address') if isinstance(keystore, dict) else keystore
+    address = source
+    try:
+        if isinstance(keystore, dict):
+            wallet_info = keystore
+            validate_key_store_content(wallet_info)
+        else:
+            try:
+                wallet_info = load_key_store_file(keystore)
+            except FileNotFoundError:
+                raise FilePathIsWrong
+        address = wallet_info['address']
+        try:
+            private_key_bytes = decode_keyfile_json(wallet_info, bytes(password, 'utf-8'))
+        except ValueError:
+            raise PasswordIsWrong
+        if f'hx{IcxSigner.from_bytes(private_key_bytes).address.hex()}' != address.lower():
+            raise AddressIsWrong
+        return address, private_key_bytes
+    except Exception as e:
+        return address, KeystoreIsNotUnlocked(source, e)
+
+
+def unlock_many(keystores, passwords, processes=None, chunk_size=1):
+    """ Decrypt many keystores across worker processes.
+
+    A keystore which fails doesn't stop the others. Its result has an instance of KeystoreIsNotUnlocked
+    instead of the private key, whose reason is the error. e.g. PasswordIsWrong, NotAKeyStoreFile
+    The address of the result is the file path when the file couldn't be read.
+    The key of a keystore whose address doesn't match the key is not returned, and the reason is AddressIsWrong.
+
+    :param keystores: Iterable of file paths or contents of keystore files.
+    :param passwords: One password for every keystore, or iterable of passwords in the order of keystores.
+                      ValueError is raised when the numbers of passwords and keystores are different.
+    :param processes: The number of worker processes. os.cpu_count() by default. 1 decrypts in this process.
+    :param chunk_size: The number of keystores given to a worker at once. type(int)
+
+    :return: generator of tuples of address and private key bytes in the order of completion.
+    """
+    if isinstance(passwords, str):
+        passwords = itertools.repeat(passwords)
+    else:
+        keystores, passwords = list(keystores), list(passwords)
+        if len(keystores) != len(passwords):
+            raise ValueError(f"The number of passwords({len(passwords)}) must be the same as "
+                             f"the number of keystores({len(keystores)}).")
+    keystores_and_passwords = zip(keystores, passwords)
+
+    if processes == 1:
+        yield from map(_unlock_keystore, keystores_and_passwords)
+        return
+
+    with Pool(processes) as pool:
+        yield from pool.imap_unordered(_unlock_keystore, keystores_and_passwords, chunk_size)
+
+
+def _reencrypt_keystore_file(file_path, password, new_password, kdf_profile):
+    try:
+        wallet_info = load_key_store_file(file_path)
+        if KdfProfile.from_keystore(wallet_info) == kdf_profile:
+            if new_password is None:
+                return file_path, ALREADY_REENCRYPTED
+            # An interrupted run may have re-encrypted it with the new password already.
+            try:
+                decode_keyfile_json(wallet_info, bytes(new_password, 'utf-8'))
+                return file_path, ALREADY_REENCRYPTED
+            except ValueError:
+                pass
+        try:
+            private_key_bytes = decode_keyfile_json(wallet_info, bytes(password, 'utf-8'))
+        except ValueError:
+            raise PasswordIsWrong
+
+        # Keep id, address and the other fields. Only the encryption changes.
+        key_store_contents = {key: value for key, value in wallet_info.items() if key.lower() != 'crypto'}
+        key_store_contents['crypto'] = kdf_profile.create_keyfile_json(
+            private_key_bytes, password if new_password is None else new_password)['crypto']
+        store_wallet_atomically(file_path, dumps(key_store_contents), overwrite=True)
+        return file_path, REENCRYPTED
+    except Exception as e:
+        return file_path, KeystoreIsNotReencrypted(file_path, e)
+
+
+def reencrypt_keystores(keystore_files, password, new_password=None, kdf_profile=None, processes=None,
+                        chunk_size=1):
+    """ Re-encrypt many keystore files in place with another kdf profile or password across worker processes.
+
+    Each file is replaced atomically, so it holds either the old or the new encryption at any time.
+    Files already in the kdf profile and the new password are skipped, so an interrupted run is resumed
+    by running it again. A file which fails doesn't stop the others. Its result is an instance of
+    KeystoreIsNotReencrypted whose reason is the error. e.g. PasswordIsWrong, NotAKeyStoreFile
+
+    :param keystore_files: Directory of keystore files, or iterable of file paths. Files starting with '.'
+                           in the directory are ignored.
+    :param password: The current password of the keystores.
+    :param new_password: Password to encrypt with. The current password when None.
+    :param kdf_profile: Instance of KdfProfile class to encrypt with. DEFAULT_KDF_PROFILE when None.
+    :param processes: The number of worker processes. os.cpu_count() by default. 1 re-encrypts in this process.
+    :param chunk_size: The number of files given to a worker at once. type(int)
+
+    :return: generator of tuples of file path and REENCRYPTED, ALREADY_REENCRYPTED or the error,
+             in the order of completion.
+    """
+    if new_password is not None and not validate_password(new_password):
+        raise PasswordIsNotAcceptable
+    if isinstance(keystore_files, str):
+        if not os.path.isdir(keystore_files):
+            raise FilePathIsWrong
+        with os.scandir(keystore_files) as entries:
+            keystore_files = sorted(entry.path for entry in entries
+                                    if not entry.name.startswith('.') and entry.is_file())
+
+    reencrypt = partial(_reencrypt_keystore_file, password=password, new_password=new_password,
+                        kdf_profile=get_kdf_profile(kdf_profile))
+    if processes == 1:
+        yield from map(reencrypt, keystore_files)
+        return
+
+    with Pool(processes) as pool:
+        yield from pool.imap_unordered(reencrypt, keystore_files, chunk_size)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import sqlite3
+import threading
+from collections import OrderedDict
+from icx.codec import dumps, loads
+
+
+def normalize_block_hash(block_hash):
+    """ Make the hash comparable regardless of '0x' prefix and case.
+    """
+    block_hash = block_hash.lower()
+    return block_hash[2:] if block_hash.startswith('0x') else block_hash
+
+
+def get_block_keys(response_json):
+    """ Get height and hash of the block in the response.
+
+    :param response_json: response result(json) of a block.
+
+    :return: (height, block_hash) or None when the response is not a confirmed block.
+    """
+    try:
+        if response_json["result"]["response_code"] != 0:
+            return None
+        block = response_json["result"]["block"]
+        return int(block["height"]), normalize_block_hash(block["block_hash"])
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+
+
+class MemoryBlockCache(object):
+    """ LRU cache of blocks in memory indexed by both height and hash.
+    Blocks are copied in and out, so changing a returned block doesn't change the cache.
+    """
+
+    def __init__(self, max_size=1024):
+        """
+        :param max_size: The maximum number of blocks to keep. type(int)
+        """
+        self.__max_size = max_size
+        self.__blocks = OrderedDict()           # height -> response json
+        self.__heights = {}                     # block hash -> height
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__blocks)
+
+    def get_by_height(self, height):
+        with self.__lock:
+            height = int(height)
+            block = self.__blocks.get(height)
+            if block is not None:
+                self.__blocks.move_to_end(height)
+        return copy.deepcopy(block)
+
+    def get_by_hash(self, block_hash):
+        with self.__lock:
+            height = self.__heights.get(normalize_block_hash(block_hash))
+            if height is None:
+                return None
+            self.__blocks.move_to_end(height)
+            block = self.__blocks[height]
+        return copy.deepcopy(block)
+
+    def put(self, response_json):
+        keys = get_block_keys(response_json)
+        if keys is None:
+            return
+        height, block_hash = keys
+        response_json = copy.deepcopy(response_json)
+        with self.__lock:
+            replaced = self.__blocks.get(height)
+            if replaced is not None:
+                # A block of another hash at the height, e.g. after a reorganization, must not be found by hash.
+                self.__heights.pop(get_block_keys(replaced)[1], None)
+            self.__blocks[height] = response_json
+            self.__blocks.move_to_end(height)
+            self.__heights[block_hash] = height
+            while len(self.__blocks) > self.__max_size:
+                _, evicted = self.__blocks.popitem(last=False)
+                self.__heights.pop(get_block_keys(evicted)[1], None)
+
+
+class DiskBlockCache(object):
+    """ Persistent store of blocks in a sqlite database indexed by both height and hash.
+    """
+
+    def __init__(self, file_path):
+        """
+        :param file_path: Path of the database file. It is created when it doesn't exist. type(str)
+        """
+        self.__connection = sqlite3.connect(file_path, check_same_thread=False)
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS blocks (height INTEGER PRIMARY KEY, hash TEXT UNIQUE NOT NULL, "
+            "content TEXT NOT NULL)")
+        self.__connection.commit()
+        self.__lock = threading.Lock()
+
+    def __get(self, query, key):
+        with self.__lock:
+            row = self.__connection.execute(query, (key,)).fetchone()
+        return loads(row[0]) if row else None
+
+    def get_by_height(self, height):
+        return self.__get("SELECT content FROM blocks WHERE height = ?", int(height))
+
+    def get_by_hash(self, block_hash):
+        return self.__get("SELECT content FROM blocks WHERE hash = ?", normalize_block_hash(block_hash))
+
+    def put(self, response_json):
+        keys = get_block_keys(response_json)
+        if keys is None:
+            return
+        height, block_hash = keys
+        with self.__lock:
+            self.__connection.execute("INSERT OR REPLACE INTO blocks (height, hash, content) VALUES (?, ?, ?)",
+                                      (height, block_hash, dumps(response_json).decode('utf-8')))
+            self.__connection.commit()
+
+    def close(self):
+        self.__connection.close()
+
+
+class TieredBlockCache(object):
+    """ Memory cache in front of a disk cache. Blocks found on disk are promoted to memory.
+    """
+
+    def __init__(self, memory_cache, disk_cache):
+        """
+        :param memory_cache: Instance of MemoryBlockCache class.
+        :param disk_cache: Instance of DiskBlockCache class.
+        """
+        self.__memory_cache = memory_cache
+        self.__disk_cache = disk_cache
+
+    def get_by_height(self, height):
+        block = self.__memory_cache.get_by_height(height)
+        if block is None:
+            block = self.__disk_cache.get_by_height(height)
+            if block is not None:
+                self.__memory_cache.put(block)
+        return block
+
+    def get_by_hash(self, block_hash):
+        block = self.__memory_cache.get_by_hash(block_hash)
+        if block is None:
+            block = self.__disk_cache.get_by_hash(block_hash)
+            if block is not None:
+                self.__memory_cache.put(block)
+        return block
+
+    def put(self, response_json):
+        self.__memory_cache.put(response_json)
+        self.__disk_cache.put(response_json)
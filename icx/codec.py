@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class StdlibJsonCodec(object):
+    """ Json codec of the standard library.
+    """
+    name = 'json'
+
+    def dumps(self, obj):
+        """
+        :return: utf-8 encoded json text. type(bytes)
+        """
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data):
+        """
+        :param data: json text. type(bytes or str)
+        """
+        return json.loads(data)
+
+
+class OrjsonCodec(StdlibJsonCodec):
+    """ Json codec of orjson which decodes bytes without making a str first.
+
+    orjson decodes integers out of the 64 bits range to floats losing precision, so documents having a number of
+    19 or more digits, which may be such an integer, are decoded by the standard library. e.g. amounts in loop
+    Runs of digits inside hex strings such as hashes follow a letter, a digit or a quote, so they don't match.
+    """
+    name = 'orjson'
+    __long_integer = re.compile(rb'(?<![\w".])-?\d{19}')
+    __long_integer_str = re.compile(r'(?<![\w".])-?\d{19}')
+
+    def dumps(self, obj):
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            return super().dumps(obj)
+
+    def loads(self, data):
+        long_integer = self.__long_integer_str if isinstance(data, str) else self.__long_integer
+        if long_integer.search(data):
+            return super().loads(data)
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return super().loads(data)
+
+
+_codec = OrjsonCodec() if orjson is not None else StdlibJsonCodec()
+
+
+def get_codec():
+    """ Get the json codec in use. The fastest installed one is used by default.
+    """
+    return _codec
+
+
+def set_codec(codec):
+    """ Replace the json codec in use.
+
+    :param codec: Object having dumps(obj) returning bytes and loads(bytes or str).
+    """
+    global _codec
+    _codec = codec
+
+
+def dumps(obj):
+    """ Encode obj to json with the codec in use.
+
+    :return: utf-8 encoded json text. type(bytes)
+    """
+    return _codec.dumps(obj)
+
+
+def loads(data):
+    """ Decode json text with the codec in use.
+
+    :param data: json text. type(bytes or str)
+    """
+    return _codec.loads(data)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import inspect
+import os
+import secrets
+import threading
+import time
+
+# The order of the secp256k1 curve.
+CURVE_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+# Environment variable naming the backend to use instead of the fastest one.
+BACKEND_ENVIRONMENT_VARIABLE = 'ICX_CRYPTO_BACKEND'
+
+
+def validate_private_key(private_key_bytes):
+    """ Check the private key is 32 bytes and in the range of the curve.
+    """
+    if not isinstance(private_key_bytes, bytes) or len(private_key_bytes) != 32:
+        raise TypeError('privkey must be composed of 32 bytes')
+    if not 0 < int.from_bytes(private_key_bytes, 'big') < CURVE_ORDER:
+        raise ValueError('invalid private key')
+
+
+def generate_private_key():
+    """ Generate a random private key in the range of the curve.
+
+    :return: 32 bytes private key. type(bytes)
+    """
+    while True:
+        private_key_bytes = secrets.token_bytes(32)
+        if 0 < int.from_bytes(private_key_bytes, 'big') < CURVE_ORDER:
+            return private_key_bytes
+
+
+class CryptoBackend(object):
+    """ Interface of the secp256k1 implementations.
+
+    A backend loads a private key into its own key object once, so that signing with the key again
+    doesn't pay for the setup. The signatures are deterministic (RFC 6979) with low S, so every backend
+    makes the same signatures.
+    """
+    name = None
+
+    def load_private_key(self, private_key_bytes):
+        """
+        :param private_key_bytes: 32 bytes private key validated by validate_private_key(). type(bytes)
+
+        :return: key object of the backend.
+        """
+        raise NotImplementedError
+
+    def get_public_key(self, key):
+        """
+        :param key: key object made by load_private_key().
+
+        :return: 65 bytes uncompressed public key. type(bytes)
+        """
+        raise NotImplementedError
+
+    def sign_recoverable(self, key, msg_hash):
+        """
+        :param key: key object made by load_private_key().
+        :param msg_hash: 32 bytes hash of the message. type(bytes)
+
+        :return: type(tuple) 64 bytes signature (r || s), recovery id. type(bytes), type(int)
+        """
+        raise NotImplementedError
+
+    def recover_public_key(self, msg_hash, signature_bytes, recovery_id):
+        """
+        :param msg_hash: 32 bytes hash of the message. type(bytes)
+        :param signature_bytes: 64 bytes signature (r || s). type(bytes)
+        :param recovery_id: 0 to 3. type(int)
+
+        :return: 65 bytes uncompressed public key. Raise ValueError when the signature is invalid. type(bytes)
+        """
+        raise NotImplementedError
+
+
+class Secp256k1Backend(CryptoBackend):
+    """ Backend of the secp256k1 binding. Keys share one context when the binding takes ctx.
+    """
+    name = 'secp256k1'
+
+    def __init__(self):
+        import secp256k1
+        self.__secp256k1 = secp256k1
+        self.__context = None
+        if 'ctx' in inspect.signature(secp256k1.PrivateKey.__init__).parameters:
+            self.__context = secp256k1.lib.secp256k1_context_create(secp256k1.ALL_FLAGS)
+        # Holder of the context for recovery, which doesn't need a key of its own.
+        self.__recoverer = self.__make_public_key()
+
+    def __make_public_key(self, public_key=None):
+        if self.__context is not None:
+            return self.__secp256k1.PublicKey(public_key, raw=False, flags=self.__secp256k1.ALL_FLAGS,
+                                              ctx=self.__context)
+        return self.__secp256k1.PublicKey(public_key, raw=False)
+
+    def load_private_key(self, private_key_bytes):
+        if self.__context is not None:
+            return self.__secp256k1.PrivateKey(private_key_bytes, raw=True, ctx=self.__context)
+        return self.__secp256k1.PrivateKey(private_key_bytes, raw=True)
+
+    def get_public_key(self, key):
+        return key.pubkey.serialize(compressed=False)
+
+    def sign_recoverable(self, key, msg_hash):
+        return key.ecdsa_recoverable_serialize(key.ecdsa_sign_recoverable(msg_hash, raw=True))
+
+    def recover_public_key(self, msg_hash, signature_bytes, recovery_id):
+        try:
+            recoverable_signature = self.__recoverer.ecdsa_recoverable_deserialize(signature_bytes, recovery_id)
+            public_key = self.__recoverer.ecdsa_recover(msg_hash, recoverable_signature, raw=True)
+        except Exception as e:
+            # The binding raises Exception itself for invalid signatures.
+            raise ValueError(str(e)) from e
+        return self.__make_public_key(public_key).serialize(compressed=False)
+
+
+class CoincurveBackend(CryptoBackend):
+    """ Backend of coincurve, the maintained binding of libsecp256k1 shipped as wheels.
+    """
+    name = 'coincurve'
+
+    def __init__(self):
+        import coincurve
+        self.__coincurve = coincurve
+
+    def load_private_key(self, private_key_bytes):
+        return self.__coincurve.PrivateKey(private_key_bytes)
+
+    def get_public_key(self, key):
+        return key.public_key.format(compressed=False)
+
+    def sign_recoverable(self, key, msg_hash):
+        signature = key.sign_recoverable(msg_hash, hasher=None)
+        return signature[:64], signature[64]
+
+    def recover_public_key(self, msg_hash, signature_bytes, recovery_id):
+        public_key = self.__coincurve.PublicKey.from_signature_and_message(
+            signature_bytes + bytes([recovery_id]), msg_hash, hasher=None)
+        return public_key.format(compressed=False)
+
+
+class PurePythonBackend(CryptoBackend):
+    """ Backend in pure python of eth-keys, which eth-keyfile already depends on. It is slow but always works.
+    """
+    name = 'python'
+
+    def __init__(self):
+        from eth_keys.backends.native import ecdsa
+        from eth_keys.exceptions import BadSignature
+        self.__ecdsa = ecdsa
+        self.__bad_signature = BadSignature
+
+    def load_private_key(self, private_key_bytes):
+        return private_key_bytes, b'\x04' + self.__ecdsa.private_key_to_public_key(private_key_bytes)
+
+    def get_public_key(self, key):
+        return key[1]
+
+    def sign_recoverable(self, key, msg_hash):
+        recovery_id, r, s = self.__ecdsa.ecdsa_raw_sign(msg_hash, key[0])
+        return r.to_bytes(32, 'big') + s.to_bytes(32, 'big'), recovery_id
+
+    def recover_public_key(self, msg_hash, signature_bytes, recovery_id):
+        r = int.from_bytes(signature_bytes[:32], 'big')
+        s = int.from_bytes(signature_bytes[32:], 'big')
+        if not (0 < r < CURVE_ORDER and 0 < s < CURVE_ORDER):
+            raise ValueError("Invalid signature")
+        try:
+            return b'\x04' + self.__ecdsa.ecdsa_raw_recover(msg_hash, (recovery_id, r, s))
+        except self.__bad_signature as e:
+            raise ValueError(str(e)) from e
+
+
+# Backends in the order of preference when they are equally fast.
+BACKEND_CLASSES = [Secp256k1Backend, CoincurveBackend, PurePythonBackend]
+
+
+def get_available_backends():
+    """ Make an instance of every backend whose library is installed.
+
+    :return: type(dict) name -> backend
+    """
+    backends = {}
+    for backend_class in BACKEND_CLASSES:
+        try:
+            backends[backend_class.name] = backend_class()
+        except ImportError:
+            continue
+    return backends
+
+
+def benchmark(backends=None, iterations=20):
+    """ Measure how many sign and recover operations each backend does in a second.
+
+    :param backends: Backends to measure. Every available backend by default. type(list)
+    :param iterations: The number of sign and recover operations per backend. type(int)
+
+    :return: type(dict) name -> operations per second
+    """
+    if backends is None:
+        backends = get_available_backends().values()
+    private_key_bytes = bytes.fromhex('df7784bc856bc3e96d5b2733957ea0a47ff39d60aaf8a3406a74b8580e8395cc')
+    msg_hash = bytes(range(32))
+    results = {}
+    for backend in backends:
+        key = backend.load_private_key(private_key_bytes)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            signature_bytes, recovery_id = backend.sign_recoverable(key, msg_hash)
+            backend.recover_public_key(msg_hash, signature_bytes, recovery_id)
+        results[backend.name] = iterations / max(time.perf_counter() - start, 1e-9)
+    return results
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def select_backend(name=None):
+    """ Choose the backend by name, or the fastest available one by a short benchmark.
+
+    :param name: Name of the backend. e.g. 'secp256k1', 'coincurve', 'python' type(str)
+
+    :return: Instance of CryptoBackend class.
+    """
+    backends = get_available_backends()
+    if name is not None:
+        if name not in backends:
+            raise ValueError(f"Crypto backend '{name}' is not available. Available: {sorted(backends)}")
+        return backends[name]
+    # The pure python backend is only a fallback, so it isn't measured when a binding is installed.
+    candidates = [backend for backend in backends.values() if backend.name != PurePythonBackend.name]
+    if not candidates:
+        return backends[PurePythonBackend.name]
+    results = benchmark(candidates, iterations=10)
+    return max(candidates, key=lambda backend: results[backend.name])
+
+
+def get_backend():
+    """ Get the backend in use. It is chosen on the first call by ICX_CRYPTO_BACKEND or select_backend().
+
+    :return: Instance of CryptoBackend class.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = select_backend(os.environ.get(BACKEND_ENVIRONMENT_VARIABLE) or None)
+    return _backend
+
+
+def set_backend(backend):
+    """ Replace the backend in use. Signers made before keep their backend.
+
+    :param backend: Name of the backend or instance of CryptoBackend class.
+    """
+    global _backend
+    if not isinstance(backend, CryptoBackend):
+        backend = select_backend(backend)
+    with _backend_lock:
+        _backend = backend
@@ -89,3 +89,35 @@ class NotAKeyStoreFile(Error):
 class AddressIsSame(Error):
     """Exception raised for 'Wallet address to transfer is same as Wallet address to deposit.' """
     pass
+
+
+class ResponseIsInvalid(Error):
+    """Exception raised for 'Response of the jsonrpc request is invalid.' """
+    pass
+
+
+class CircuitIsOpen(Error):
+    """Exception raised for 'Requests to the node are blocked because it failed too many times.' """
+    pass
+
+
+class KeystoreIsNotUnlocked(Error):
+    """Exception raised for 'Keystore could not be unlocked.' It names the keystore and the error as the reason. """
+    def __init__(self, keystore, reason):
+        super().__init__(keystore, reason)
+        self.keystore = keystore
+        self.reason = reason
+
+    def __str__(self):
+        return f"Keystore {self.keystore} is not unlocked: {type(self.reason).__name__} {self.reason}".rstrip()
+
+
+class KeystoreIsNotReencrypted(Error):
+    """Exception raised for 'Keystore could not be re-encrypted.' It names the keystore and the error as the reason. """
+    def __init__(self, keystore, reason):
+        super().__init__(keystore, reason)
+        self.keystore = keystore
+        self.reason = reason
+
+    def __str__(self):
+        return f"Keystore {self.keystore} is not re-encrypted: {type(self.reason).__name__} {self.reason}".rstrip()
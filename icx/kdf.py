@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from eth_keyfile import create_keyfile_json
+
+KDFS = ('pbkdf2', 'scrypt')
+
+
+class KdfProfile(object):
+    """ Key derivation function and its cost used to encrypt keystores.
+
+    The cost is the iteration count of pbkdf2 or N of scrypt, which must be a power of 2.
+    r and p of scrypt are fixed by eth-keyfile. Every profile is read by decode_keyfile_json(),
+    because the keystore records its parameters.
+    """
+
+    def __init__(self, kdf='pbkdf2', cost=262144):
+        """
+        :param kdf: 'pbkdf2' or 'scrypt' type(str)
+        :param cost: The iteration count of pbkdf2 or N of scrypt. type(int)
+        """
+        if kdf not in KDFS:
+            raise ValueError(f"kdf must be one of {KDFS}.")
+        if not isinstance(cost, int) or cost < 1:
+            raise ValueError("cost must be a positive integer.")
+        if kdf == 'scrypt' and (cost < 2 or cost & (cost - 1)):
+            raise ValueError("cost of scrypt must be a power of 2.")
+        self.__kdf = kdf
+        self.__cost = cost
+
+    @property
+    def kdf(self):
+        return self.__kdf
+
+    @property
+    def cost(self):
+        return self.__cost
+
+    def __eq__(self, other):
+        return isinstance(other, KdfProfile) and (self.kdf, self.cost) == (other.kdf, other.cost)
+
+    def __hash__(self):
+        return hash((self.kdf, self.cost))
+
+    def __repr__(self):
+        return f'KdfProfile({self.kdf!r}, {self.cost})'
+
+    def create_keyfile_json(self, private_key_bytes, password):
+        """ Encrypt the private key into a keystore of version 3.
+
+        :param private_key_bytes: 32 bytes private key. type(bytes)
+        :param password: Password. type(str)
+
+        :return: keystore contents without address and coinType. type(dict)
+        """
+        return create_keyfile_json(private_key_bytes, bytes(password, 'utf-8'), kdf=self.kdf, iterations=self.cost)
+
+    @staticmethod
+    def from_keystore(key_store_contents):
+        """ Get the profile which encrypted the keystore.
+
+        :param key_store_contents: type(dict)
+
+        :return: Instance of KdfProfile class.
+        """
+        crypto = key_store_contents.get('crypto') or key_store_contents['Crypto']
+        kdf_params = crypto['kdfparams']
+        return KdfProfile(crypto['kdf'], kdf_params['c'] if crypto['kdf'] == 'pbkdf2' else kdf_params['n'])
+
+
+# The profile of the keystores made by ICON wallets.
+DEFAULT_KDF_PROFILE = KdfProfile('pbkdf2', 262144)
+
+# scrypt with the default cost of eth-keyfile.
+SCRYPT_KDF_PROFILE = KdfProfile('scrypt', 262144)
+
+# Cheap enough to make a thousand keystores in a second or two. It gives no protection against guessing the password,
+# so use it only for tests and ephemeral wallets whose keystores never leave the machine.
+LOW_COST_KDF_PROFILE = KdfProfile('pbkdf2', 1024)
+
+
+def get_kdf_profile(kdf_profile=None):
+    """ Get the profile to use.
+
+    :param kdf_profile: Instance of KdfProfile class. DEFAULT_KDF_PROFILE when None.
+
+    :return: Instance of KdfProfile class.
+    """
+    if kdf_profile is None:
+        return DEFAULT_KDF_PROFILE
+    if not isinstance(kdf_profile, KdfProfile):
+        raise TypeError("kdf_profile must be an instance of KdfProfile.")
+    return kdf_profile
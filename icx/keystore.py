@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sqlite3
+import threading
+from icx.custom_error import NotAKeyStoreFile
+from icx.utils import load_key_store_file
+
+# Name of the index database kept in the directory. Files starting with '.' aren't indexed.
+INDEX_FILE_NAME = '.keystore_index.sqlite'
+
+
+def _read_address(file_path):
+    """ Get the address of the keystore file, or None when the file isn't a keystore.
+    """
+    try:
+        address = load_key_store_file(file_path)['address']
+    except (NotAKeyStoreFile, OSError):
+        return None
+    return address.lower() if isinstance(address, str) else None
+
+
+class KeystoreDirectory(object):
+    """ Index of the keystore files of a directory by address, persisted in a sqlite database.
+
+    Opening the index doesn't read the directory. refresh() lists the directory and parses only the files
+    which are new or whose mtime or size changed since they were indexed. A lookup is one query of the index
+    and one stat of the file found, even when the address isn't indexed.
+    """
+
+    def __init__(self, directory, index_path=None):
+        """
+        :param directory: Directory of the keystore files. type(str)
+        :param index_path: Path of the index database. INDEX_FILE_NAME in the directory by default. type(str)
+        """
+        self.__directory = directory
+        self.__connection = sqlite3.connect(index_path or os.path.join(directory, INDEX_FILE_NAME),
+                                            check_same_thread=False)
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS files (file_name TEXT PRIMARY KEY, address TEXT, "
+            "mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL)")
+        self.__connection.execute("CREATE INDEX IF NOT EXISTS files_address ON files (address)")
+        self.__connection.commit()
+        self.__lock = threading.Lock()
+
+    @property
+    def directory(self):
+        return self.__directory
+
+    def __len__(self):
+        with self.__lock:
+            return self.__connection.execute("SELECT COUNT(*) FROM files WHERE address IS NOT NULL").fetchone()[0]
+
+    def __contains__(self, address):
+        return self.get_file_path(address) is not None
+
+    def refresh(self):
+        """ Bring the index up to date with the directory.
+
+        :return: The number of files parsed. type(int)
+        """
+        with self.__lock:
+            indexed = {file_name: (mtime_ns, size) for file_name, mtime_ns, size in
+                       self.__connection.execute("SELECT file_name, mtime_ns, size FROM files")}
+            changes = []
+            with os.scandir(self.__directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.') or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    if indexed.pop(entry.name, None) != (stat.st_mtime_ns, stat.st_size):
+                        changes.append((entry.name, _read_address(entry.path), stat.st_mtime_ns, stat.st_size))
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO files (file_name, address, mtime_ns, size) VALUES (?, ?, ?, ?)", changes)
+            self.__connection.executemany("DELETE FROM files WHERE file_name = ?", [(name,) for name in indexed])
+            self.__connection.commit()
+        return len(changes)
+
+    def get_file_path(self, address, refresh=False):
+        """ Find the keystore file of the address.
+
+        A miss doesn't read the directory, so call refresh() when files are added. A file changed since it was
+        indexed is parsed again on its own.
+
+        :param address: Address starting with 'hx'. type(str)
+        :param refresh: Refresh the index when the address isn't found. It lists the whole directory. type(bool)
+
+        :return: Path of the keystore file, or None when there is no file of the address.
+        """
+        address = address.lower()
+        file_path = self.__find(address)
+        if file_path is None and refresh:
+            self.refresh()
+            file_path = self.__find(address)
+        return file_path
+
+    def __find(self, address):
+        with self.__lock:
+            rows = self.__connection.execute(
+                "SELECT file_name, mtime_ns, size FROM files WHERE address = ?", (address,)).fetchall()
+            found = None
+            for file_name, mtime_ns, size in rows:
+                file_path = os.path.join(self.__directory, file_name)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    self.__connection.execute("DELETE FROM files WHERE file_name = ?", (file_name,))
+                    continue
+                if (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+                    file_address = _read_address(file_path)
+                    self.__connection.execute(
+                        "UPDATE files SET address = ?, mtime_ns = ?, size = ? WHERE file_name = ?",
+                        (file_address, stat.st_mtime_ns, stat.st_size, file_name))
+                    if file_address != address:
+                        continue
+                if found is None:
+                    found = file_path
+            self.__connection.commit()
+        return found
+
+    def get_addresses(self):
+        """ Get the indexed addresses. Call refresh() first to include the latest files.
+
+        :return: list of addresses.
+        """
+        with self.__lock:
+            return [row[0] for row in self.__connection.execute(
+                "SELECT DISTINCT address FROM files WHERE address IS NOT NULL ORDER BY address")]
+
+    def close(self):
+        self.__connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Re-encrypt a directory of keystore files with another kdf profile or password.
+
+    python -m icx.reencrypt <directory> [--kdf pbkdf2|scrypt] [--cost N] [--new-password] [--processes N]
+
+The passwords are prompted. Run it again to resume after an interruption.
+"""
+
+import argparse
+import getpass
+import sys
+import os
+from icx.bulk import reencrypt_keystores, REENCRYPTED, ALREADY_REENCRYPTED
+from icx.kdf import KdfProfile, DEFAULT_KDF_PROFILE
+from icx.utils import validate_password
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m icx.reencrypt', description=__doc__.splitlines()[0])
+    parser.add_argument('directory', help='directory of the keystore files')
+    parser.add_argument('--kdf', choices=('pbkdf2', 'scrypt'), default=DEFAULT_KDF_PROFILE.kdf)
+    parser.add_argument('--cost', type=int, default=DEFAULT_KDF_PROFILE.cost,
+                        help='iterations of pbkdf2 or N of scrypt')
+    parser.add_argument('--new-password', action='store_true', help='prompt for a new password')
+    parser.add_argument('--processes', type=int, default=None, help='worker processes. the number of cpus by default')
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        parser.error(f'{args.directory} is not a directory.')
+    try:
+        kdf_profile = KdfProfile(args.kdf, args.cost)
+    except ValueError as e:
+        parser.error(str(e))
+    password = getpass.getpass('Password: ')
+    new_password = None
+    if args.new_password:
+        new_password = getpass.getpass('New password: ')
+        if not validate_password(new_password):
+            parser.error('The new password must have alphabet characters, numbers and special characters.')
+        if new_password != getpass.getpass('Repeat new password: '):
+            parser.error('The new passwords are different.')
+
+    counts = {REENCRYPTED: 0, ALREADY_REENCRYPTED: 0, 'failed': 0}
+    for file_path, result in reencrypt_keystores(args.directory, password, new_password, kdf_profile,
+                                                 args.processes):
+        if isinstance(result, Exception):
+            counts['failed'] += 1
+            print(result, file=sys.stderr)
+        else:
+            counts[result] += 1
+            print(f'{result}\t{file_path}')
+    print(f"{counts[REENCRYPTED]} re-encrypted, {counts[ALREADY_REENCRYPTED]} already re-encrypted, "
+          f"{counts['failed']} failed", file=sys.stderr)
+    return 1 if counts['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
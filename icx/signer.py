@@ -16,7 +16,51 @@
 # limitations under the License.
 
 import hashlib
-from secp256k1 import PrivateKey
+from functools import lru_cache
+from icx.crypto import get_backend, generate_private_key, validate_private_key
+
+# The number of signers kept by get_signer().
+SIGNER_CACHE_SIZE = 128
+
+
+def public_key_to_address(public_key_bytes):
+    """ Get the address of the uncompressed public key.
+
+    :param public_key_bytes: 65 bytes uncompressed public key. type(bytes)
+
+    :return: 20 bytes address. type(bytes)
+    """
+    return hashlib.sha3_256(public_key_bytes[1:]).digest()[-20:]
+
+
+def recover_public_key(msg_hash, recoverable_signature_bytes):
+    """ Recover the public key which made the recoverable signature of the message hash.
+
+    :param msg_hash: Hash data of message. type(bytes)
+    :param recoverable_signature_bytes: 64 bytes signature + 1 byte recovery id. type(bytes)
+
+    :return: 65 bytes uncompressed public key. type(bytes)
+    """
+    if len(recoverable_signature_bytes) != 65:
+        raise ValueError("The recoverable signature must be 65 bytes.")
+    if recoverable_signature_bytes[64] > 3:
+        raise ValueError("The recovery id must be 0 to 3.")
+    return get_backend().recover_public_key(
+        msg_hash, recoverable_signature_bytes[:64], recoverable_signature_bytes[64])
+
+
+def _encode_der_integer(value_bytes):
+    value_bytes = value_bytes.lstrip(b'\x00') or b'\x00'
+    if value_bytes[0] & 0x80:
+        value_bytes = b'\x00' + value_bytes
+    return b'\x02' + bytes([len(value_bytes)]) + value_bytes
+
+
+def _encode_der_signature(signature_bytes):
+    """ Encode 64 bytes signature (r || s) in DER.
+    """
+    sequence = _encode_der_integer(signature_bytes[:32]) + _encode_der_integer(signature_bytes[32:])
+    return b'\x30' + bytes([len(sequence)]) + sequence
 
 
 class IcxSigner(object):
@@ -28,35 +72,48 @@ class IcxSigner(object):
         :param data bytes or der (object):
         :param raw: (bool) True(bytes) False(der)
         """
-        self.__private_key = PrivateKey(data, raw)
+        self.__backend = get_backend()
+        self.__public_key_bytes = None
+        self.__address = None
+        if data is None:
+            data = generate_private_key()
+        elif not raw:
+            data = bytes.fromhex(data)
+        self.private_key = data
 
     @property
     def private_key_bytes(self):
-        return self.__private_key.private_key
+        return self.__private_key_bytes
 
     @private_key_bytes.setter
     def private_key(self, data):
-        self.__private_key.set_raw_privkey(data)
+        validate_private_key(data)
+        self.__private_key = self.__backend.load_private_key(data)
+        self.__private_key_bytes = data
+        self.__public_key_bytes = None
+        self.__address = None
 
     @property
     def public_key_bytes(self):
-        return self.__private_key.pubkey.serialize(compressed=False)
+        if self.__public_key_bytes is None:
+            self.__public_key_bytes = self.__backend.get_public_key(self.__private_key)
+        return self.__public_key_bytes
 
     @property
     def address(self):
-        public_key_bytes = self.public_key_bytes
-        return hashlib.sha3_256(public_key_bytes[1:]).digest()[-20:]
+        if self.__address is None:
+            self.__address = public_key_to_address(self.public_key_bytes)
+        return self.__address
 
     def sign(self, msg_hash):
         """ Make a signature using the hash value of msg.
 
         :param msg_hash: Result of sha3_256(msg) type(bytes)
 
-        :return: Signature. type(bytes)
+        :return: Signature in DER. type(bytes)
         """
-        private_key_object = self.__private_key
-        signature = private_key_object.ecdsa_sign(msg_hash, raw=True)
-        return private_key_object.ecdsa_serialize(signature)
+        signature_bytes, _ = self.__backend.sign_recoverable(self.__private_key, msg_hash)
+        return _encode_der_signature(signature_bytes)
 
     def sign_recoverable(self, msg_hash):
         """ Make a recoverable signature using message hash data. We can extract public key from recoverable signature.
@@ -65,11 +122,9 @@ class IcxSigner(object):
 
         :return:
         type(tuple)
-        type(bytes): 65 bytes data , type(int): recovery id
+        type(bytes): 64 bytes signature , type(int): recovery id
         """
-        private_key_object = self.__private_key
-        recoverable_signature = private_key_object.ecdsa_sign_recoverable(msg_hash, raw=True)
-        return private_key_object.ecdsa_recoverable_serialize(recoverable_signature)
+        return self.__backend.sign_recoverable(self.__private_key, msg_hash)
 
     @staticmethod
     def from_bytes(data):
@@ -77,4 +132,22 @@ class IcxSigner(object):
 
     @staticmethod
     def from_der(data):
-        return IcxSigner(data, raw=False)
\ No newline at end of file
+        return IcxSigner(data, raw=False)
+
+
+@lru_cache(maxsize=SIGNER_CACHE_SIZE)
+def get_signer(private_key_bytes):
+    """ Get a signer of the private key from the cache of recently used signers.
+    The signer is shared, so don't change its private key.
+
+    :param private_key_bytes: 32 bytes private key. type(bytes)
+
+    :return: Instance of IcxSigner class.
+    """
+    return IcxSigner.from_bytes(private_key_bytes)
+
+
+def clear_signer_cache():
+    """ Drop the cached signers and the private keys in them.
+    """
+    get_signer.cache_clear()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import codecs
+from json import JSONDecoder, JSONDecodeError
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = ',:]}' + _WHITESPACE
+_decoder = JSONDecoder()
+
+
+class JsonStream(object):
+    """ Pull parser reading json values one by one from chunks of bytes.
+
+    Only the structure leading to the values of interest is walked by the caller;
+    every other value is decoded as a whole.
+    """
+
+    def __init__(self, chunks):
+        """
+        :param chunks: Iterable of bytes of the json text.
+        """
+        self.__chunks = iter(chunks)
+        self.__decode = codecs.getincrementaldecoder('utf-8')().decode
+        self.__buffer = ''
+        self.__pos = 0
+        self.__eof = False
+
+    def __fill(self):
+        """ Read the next chunk into the buffer dropping the parsed part.
+
+        :return: False when there is no more chunk.
+        """
+        if self.__eof:
+            return False
+        self.__buffer = self.__buffer[self.__pos:]
+        self.__pos = 0
+        for chunk in self.__chunks:
+            text = self.__decode(chunk)
+            if text:
+                self.__buffer += text
+                return True
+        self.__buffer += self.__decode(b'', final=True)
+        self.__eof = True
+        return False
+
+    def peek(self):
+        """ Get the next character which is not white space without consuming it.
+
+        :return: character or None at the end of the text.
+        """
+        while True:
+            while self.__pos < len(self.__buffer) and self.__buffer[self.__pos] in _WHITESPACE:
+                self.__pos += 1
+            if self.__pos < len(self.__buffer):
+                return self.__buffer[self.__pos]
+            if not self.__fill():
+                return None
+
+    def expect(self, character):
+        if self.peek() != character:
+            raise ValueError(f"'{character}' is expected at the position {self.__pos} of the json stream.")
+        self.__pos += 1
+
+    def read_value(self):
+        """ Decode the next value as a whole.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.__buffer, self.__pos)
+            except JSONDecodeError:
+                if self.__fill():
+                    continue
+                raise
+            # A number may continue in the next chunk, so the value must be followed by a delimiter.
+            if (end == len(self.__buffer) or self.__buffer[end] not in _DELIMITERS) and self.__fill():
+                continue
+            self.__pos = end
+            return value
+
+    def iter_object_keys(self):
+        """ Yield the keys of the object starting at the current position.
+        The caller must consume the value of each key before getting the next key.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.__pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(':')
+            yield key
+            if self.peek() == ',':
+                self.__pos += 1
+                continue
+            self.expect('}')
+            return
+
+    def iter_array(self):
+        """ Yield the values of the array starting at the current position.
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self.__pos += 1
+            return
+        while True:
+            yield self.read_value()
+            if self.peek() == ',':
+                self.__pos += 1
+                continue
+            self.expect(']')
+            return
+
+
+class StreamedBlock(object):
+    """ Block response whose transactions are parsed one by one while the response body arrives.
+
+    The fields of the block before confirmed_transaction_list are in header on creation.
+    The others are added to header when the iteration of the transactions is over.
+    """
+
+    def __init__(self, response, chunk_size=65536):
+        """
+        :param response: Streamed response of icx_getBlockByHeight or icx_getBlockByHash.
+        :param chunk_size: Bytes to read at once. type(int)
+        """
+        self.__response = response
+        self.content = {}                       # the response without the block
+        self.header = {}                        # the block without confirmed_transaction_list
+        self.__transactions = self.__parse(JsonStream(response.iter_content(chunk_size)))
+        # Parse up to the transactions so that the header fields before them are available.
+        next(self.__transactions, None)
+
+    @property
+    def response_code(self):
+        return self.content.get('result', {}).get('response_code')
+
+    def __parse(self, stream):
+        try:
+            for key in stream.iter_object_keys():
+                if key != 'result' or stream.peek() != '{':
+                    self.content[key] = stream.read_value()
+                    continue
+                result = self.content[key] = {}
+                for result_key in stream.iter_object_keys():
+                    if result_key != 'block' or stream.peek() != '{':
+                        result[result_key] = stream.read_value()
+                        continue
+                    for block_key in stream.iter_object_keys():
+                        if block_key != 'confirmed_transaction_list' or stream.peek() != '[':
+                            self.header[block_key] = stream.read_value()
+                            continue
+                        yield None
+                        yield from stream.iter_array()
+        finally:
+            self.close()
+
+    def __iter__(self):
+        return self.__transactions
+
+    def close(self):
+        self.__response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.__transactions.close()
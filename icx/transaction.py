@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+from icx.utils import make_unsigned_params, sign
+
+
+class TransactionTemplate(object):
+    """ Builder of icx_sendTransaction params of one sender and one fee.
+
+    The sorted keys of the params are fee, from, timestamp, to and value, so the phrase of every transaction
+    starts with the same fee and from. The hash state of that prefix is computed once and copied for each
+    transaction, and only timestamp, to and value are hashed. tx_hash is the same as get_tx_hash() gives.
+    """
+
+    method = 'icx_sendTransaction'
+
+    def __init__(self, user_address, private_key_bytes, fee=10000000000000000):
+        """
+        :param user_address: Address of user's wallet.
+        :param private_key_bytes: Private key of user's wallet. type(bytes)
+        :param fee: Transaction fee. type(int)
+        """
+        self.__user_address = user_address
+        self.__private_key_bytes = private_key_bytes
+        self.__fee = fee
+        self.__prefix_hash = hashlib.sha3_256(f'{self.method}.fee.{hex(fee)}.from.{user_address}.timestamp.'.encode())
+
+    @property
+    def user_address(self):
+        return self.__user_address
+
+    @property
+    def fee(self):
+        return self.__fee
+
+    def get_tx_hash(self, params):
+        """ Create tx_hash of params made by this template.
+
+        :param params: Params whose keys are fee, from, timestamp, to and value. type(dict)
+
+        :return: bytes: sha3_256 hash value
+        """
+        hash_object = self.__prefix_hash.copy()
+        hash_object.update(f"{params['timestamp']}.to.{params['to']}.value.{params['value']}".encode())
+        return hash_object.digest()
+
+    def make_params(self, to, amount, timestamp=None):
+        """ Make signed params for jsonrpc format.
+
+        :param to: Address of wallet to receive the asset.
+        :param amount: Amount of money. type(int)
+        :param timestamp: Epoch time in us. The current time is used when None.
+
+        :return: type(dict)
+        """
+        params = make_unsigned_params(self.__user_address, to, amount, self.__fee, timestamp)
+        tx_hash_bytes = self.get_tx_hash(params)
+        params['tx_hash'] = tx_hash_bytes.hex()
+        params['signature'] = sign(self.__private_key_bytes, tx_hash_bytes).decode()
+        return params
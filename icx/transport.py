@@ -0,0 +1,671 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import math
+import random
+import ssl
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from urllib.parse import urlsplit, urlunsplit
+import certifi
+import requests
+from requests.adapters import HTTPAdapter
+from icx.codec import dumps, loads
+from icx.custom_error import CircuitIsOpen
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Methods which can be sent to more than one node without side effects.
+READ_ONLY_METHODS = frozenset(['icx_getBalance', 'icx_getLastBlock', 'icx_getBlockByHeight', 'icx_getBlockByHash'])
+
+
+def is_read_only(payload):
+    """ Check every call in the jsonrpc request content is read only.
+
+    :param payload: Jsonrpc request content or list of them for a batch request.
+    """
+    calls = payload if isinstance(payload, list) else [payload]
+    return all(call.get('method') in READ_ONLY_METHODS for call in calls)
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class RetryPolicy(object):
+    """ How many times and how long to wait before sending a failed request again.
+
+    The same payload is sent again, so a signed transaction keeps its signature and tx_hash
+    and the node can't accept it twice.
+    """
+
+    def __init__(self, max_retries=2, backoff_factor=0.1, max_backoff=5.0, retry_status=(502, 503, 504)):
+        """
+        :param max_retries: The number of retries after the first attempt. type(int)
+        :param backoff_factor: The base of the exponential backoff in seconds. type(float)
+        :param max_backoff: The upper bound of the backoff in seconds. type(float)
+        :param retry_status: Http status codes to retry on.
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_status = frozenset(retry_status)
+
+    def get_backoff(self, attempt):
+        """ Get the time to wait before the next attempt with full jitter.
+
+        :param attempt: The number of attempts failed so far minus one. type(int)
+
+        :return: seconds. type(float)
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+
+class CircuitBreaker(object):
+    """ Fail fast after consecutive failures of a node and try again after reset_timeout.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        """
+        :param failure_threshold: The number of consecutive failures to open the circuit. type(int)
+        :param reset_timeout: Seconds to block the requests once the circuit is open. type(float)
+        """
+        self.__failure_threshold = failure_threshold
+        self.__reset_timeout = reset_timeout
+        self.__failure_count = 0
+        self.__opened_at = None
+        self.__lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self.__opened_at is not None
+
+    @property
+    def is_available(self):
+        """ Whether allow() would let a request through now.
+        """
+        opened_at = self.__opened_at
+        return opened_at is None or time.monotonic() - opened_at >= self.__reset_timeout
+
+    def allow(self):
+        """ Check a request can be sent. One trial request is let through after reset_timeout.
+        """
+        with self.__lock:
+            if self.__opened_at is None:
+                return True
+            if time.monotonic() - self.__opened_at >= self.__reset_timeout:
+                # Half open: block the others until the trial request reports its result.
+                self.__opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self.__lock:
+            self.__failure_count = 0
+            self.__opened_at = None
+
+    def record_failure(self):
+        with self.__lock:
+            self.__failure_count += 1
+            if self.__failure_count >= self.__failure_threshold:
+                self.__opened_at = time.monotonic()
+
+
+class HttpTransport(object):
+    """ HTTP transport keeping a pool of keep-alive connections.
+
+    One instance can be shared by every wallet and helper function so that
+    consecutive requests to the same node reuse the TCP and TLS connection.
+    Failed requests are retried by the retry policy and each node has its own circuit breaker.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, verify=None, timeout=(3.05, 30.0), retry_policy=None,
+                 failure_threshold=5, reset_timeout=30.0):
+        """
+        :param pool_connections: Number of hosts to keep connection pools for. type(int)
+        :param pool_maxsize: Maximum number of connections kept per host. type(int)
+        :param verify: Path of the CA bundle. certifi's bundle is used by default. type(str)
+        :param timeout: (connect timeout, read timeout) in seconds. type(tuple)
+        :param retry_policy: Instance of RetryPolicy class. RetryPolicy() is used by default.
+        :param failure_threshold: Consecutive failures to open the circuit of a node. None disables it. type(int)
+        :param reset_timeout: Seconds to fail fast once the circuit of a node is open. type(float)
+        """
+        self.__verify = verify if verify is not None else certifi.where()
+        self.__timeout = timeout
+        self.__retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.__failure_threshold = failure_threshold
+        self.__reset_timeout = reset_timeout
+        self.__circuit_breakers = {}
+        self.__circuit_breakers_lock = threading.Lock()
+        self.__session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.__session.mount('https://', adapter)
+        self.__session.mount('http://', adapter)
+
+    @property
+    def session(self):
+        return self.__session
+
+    @property
+    def verify(self):
+        return self.__verify
+
+    def get_circuit_breaker(self, url):
+        """ Get the circuit breaker of the node serving url.
+
+        :param url: Api url. type(str)
+
+        :return: Instance of CircuitBreaker class or None when it is disabled.
+        """
+        if self.__failure_threshold is None:
+            return None
+        split_url = urlsplit(url)
+        endpoint = f'{split_url.scheme}://{split_url.netloc}'
+        with self.__circuit_breakers_lock:
+            circuit_breaker = self.__circuit_breakers.get(endpoint)
+            if circuit_breaker is None:
+                circuit_breaker = CircuitBreaker(self.__failure_threshold, self.__reset_timeout)
+                self.__circuit_breakers[endpoint] = circuit_breaker
+            return circuit_breaker
+
+    def post(self, url, payload, stream=False):
+        """ Send payload to url as json.
+
+        :param url: Api url. type(str)
+        :param payload: Jsonrpc request content. type(dict)
+        :param stream: Return as soon as the headers arrive and leave the body to be read. type(bool)
+
+        :return: response
+        """
+        circuit_breaker = self.get_circuit_breaker(url)
+        retry_policy = self.__retry_policy
+        attempt = 0
+        while True:
+            if circuit_breaker is not None and not circuit_breaker.allow():
+                raise CircuitIsOpen
+            try:
+                response = self.__session.post(url, data=dumps(payload), headers=_JSON_HEADERS,
+                                               verify=self.__verify, timeout=self.__timeout, stream=stream)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if circuit_breaker is not None:
+                    circuit_breaker.record_failure()
+                if attempt >= retry_policy.max_retries:
+                    if isinstance(e, requests.exceptions.Timeout):
+                        raise RuntimeError("Timeout happened. Check your internet connection status.")
+                    raise
+            else:
+                if response.status_code not in retry_policy.retry_status:
+                    if circuit_breaker is not None:
+                        circuit_breaker.record_success()
+                    return response
+                if circuit_breaker is not None:
+                    circuit_breaker.record_failure()
+                if attempt >= retry_policy.max_retries:
+                    return response
+                response.close()
+            time.sleep(retry_policy.get_backoff(attempt))
+            attempt += 1
+
+    def close(self):
+        self.__session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class NodeStats(object):
+    """ Moving averages of the latency and the error rate of a node.
+    """
+
+    def __init__(self, uri, alpha=0.2, sample_size=100):
+        """
+        :param uri: Scheme and host of the node. e.g. 'https://wallet.icon.foundation' type(str)
+        :param alpha: Weight of the latest sample in the moving averages. type(float)
+        :param sample_size: The number of recent latencies kept for the percentiles. type(int)
+        """
+        self.uri = uri
+        self.latency = None
+        self.error_rate = 0.0
+        self.recent_latencies = deque(maxlen=sample_size)
+        self.__alpha = alpha
+        self.__lock = threading.Lock()
+
+    @property
+    def score(self):
+        """ Expected seconds to get a successful response. The lower the better.
+        Nodes without any sample score 0 so that every node gets tried.
+        """
+        if self.latency is None:
+            return 0.0
+        return self.latency / max(1.0 - self.error_rate, 0.01)
+
+    def __record(self, elapsed, error):
+        with self.__lock:
+            alpha = self.__alpha
+            self.latency = elapsed if self.latency is None else alpha * elapsed + (1 - alpha) * self.latency
+            self.error_rate = alpha * error + (1 - alpha) * self.error_rate
+
+    def get_latency_percentile(self, percentile):
+        """ Get the percentile of the recent latencies of successful requests.
+
+        :param percentile: 0 < percentile <= 100. type(float)
+
+        :return: seconds or None when there is no sample. type(float)
+        """
+        with self.__lock:
+            latencies = sorted(self.recent_latencies)
+        if not latencies:
+            return None
+        return latencies[max(math.ceil(percentile / 100 * len(latencies)) - 1, 0)]
+
+    def record_success(self, elapsed):
+        self.__record(elapsed, 0.0)
+        with self.__lock:
+            self.recent_latencies.append(elapsed)
+
+    def record_failure(self, elapsed):
+        self.__record(elapsed, 1.0)
+
+
+def _start_thread(function, *args):
+    """ Call the function on a new thread.
+
+    :return: Instance of Future class having the result of the function.
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(function(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+class NodePoolTransport(object):
+    """ Transport sending each request to the best healthy node of several nodes and failing over to the others.
+
+    The scheme and the host of the requested url are replaced with those of the chosen node,
+    and the path (e.g. /api/v2) is kept.
+
+    With hedging, a read only request which the best node doesn't answer within the hedge delay is sent
+    to the second best node as well, and the response arriving first is used. The other request can't be
+    interrupted, so its response is discarded when it arrives.
+    """
+
+    def __init__(self, uris, transport=None, alpha=0.2, hedge_delay=None, hedge_percentile=None,
+                 min_hedge_samples=10, hedge_workers=16):
+        """
+        :param uris: Scheme and host of the nodes. e.g. ['https://node1:9000', 'https://node2:9000'] type(list)
+        :param transport: Instance of HttpTransport class sending the requests. By default it doesn't retry
+                          because a failed request is sent to the next node instead.
+        :param alpha: Weight of the latest sample in the moving averages. type(float)
+        :param hedge_delay: Seconds to wait for the best node before hedging. It is used until the node has
+                            min_hedge_samples latencies when hedge_percentile is given. type(float)
+        :param hedge_percentile: Hedge when the best node is slower than this percentile of its recent
+                                 latencies. e.g. 95 It requires hedge_delay for the requests before that.
+                                 type(float)
+        :param min_hedge_samples: The number of latencies needed to use hedge_percentile. type(int)
+        :param hedge_workers: The number of threads sending the hedge requests to the second best node.
+                              The requests to the best node are sent on threads of their own, so they neither
+                              wait for these threads nor are limited by their number. type(int)
+        """
+        if not uris:
+            raise ValueError("At least one node is required.")
+        if hedge_percentile is not None and hedge_delay is None:
+            raise ValueError("hedge_delay is required with hedge_percentile to hedge until enough latencies are "
+                             "recorded.")
+        self.__transport = transport if transport is not None else HttpTransport(
+            pool_connections=len(uris), retry_policy=RetryPolicy(max_retries=0))
+        self.__nodes = [NodeStats(uri.rstrip('/'), alpha) for uri in uris]
+        self.__hedge_delay = hedge_delay
+        self.__hedge_percentile = hedge_percentile
+        self.__min_hedge_samples = min_hedge_samples
+        self.__executor = None
+        if hedge_delay is not None or hedge_percentile is not None:
+            self.__executor = ThreadPoolExecutor(max_workers=hedge_workers)
+
+    @property
+    def transport(self):
+        return self.__transport
+
+    @property
+    def nodes(self):
+        return list(self.__nodes)
+
+    def get_node_url(self, node, url):
+        split_node_uri = urlsplit(node.uri)
+        return urlunsplit(urlsplit(url)._replace(scheme=split_node_uri.scheme, netloc=split_node_uri.netloc))
+
+    def rank_nodes(self, url):
+        """ Order the nodes from the best. Nodes whose circuit is open come last.
+        """
+        def rank(node):
+            circuit_breaker = self.__transport.get_circuit_breaker(self.get_node_url(node, url))
+            is_available = circuit_breaker is None or circuit_breaker.is_available
+            return not is_available, node.score
+        return sorted(self.__nodes, key=rank)
+
+    def post_to_node(self, node, url, payload, stream=False):
+        """ Send payload to the node and record the result in the statistics of the node.
+
+        :return: response
+        """
+        start = time.monotonic()
+        try:
+            if stream:
+                response = self.__transport.post(self.get_node_url(node, url), payload, stream=True)
+            else:
+                response = self.__transport.post(self.get_node_url(node, url), payload)
+        except (requests.exceptions.RequestException, RuntimeError, CircuitIsOpen):
+            node.record_failure(time.monotonic() - start)
+            raise
+        if response.status_code >= 500:
+            node.record_failure(time.monotonic() - start)
+        else:
+            node.record_success(time.monotonic() - start)
+        return response
+
+    def get_hedge_delay(self, node):
+        """ Get seconds to wait for the node before hedging.
+
+        :return: seconds, or None when hedging is off. type(float)
+        """
+        if self.__hedge_percentile is not None and len(node.recent_latencies) >= self.__min_hedge_samples:
+            return node.get_latency_percentile(self.__hedge_percentile)
+        return self.__hedge_delay
+
+    def post_hedged(self, primary, secondary, url, payload):
+        """ Send payload to the primary node, and to the secondary node too if the primary is slow or fails.
+
+        :return: (response, error) of the first successful request, or of the last failed one.
+        """
+        # Not on the executor, where waiting for a thread would count toward the hedge delay.
+        first = _start_thread(self.post_to_node, primary, url, payload)
+        try:
+            response = first.result(timeout=self.get_hedge_delay(primary))
+            if response.status_code < 500:
+                return response, None
+        except FutureTimeoutError:
+            pass
+        except (requests.exceptions.RequestException, RuntimeError, CircuitIsOpen):
+            pass
+
+        futures = [first, self.__executor.submit(self.post_to_node, secondary, url, payload)]
+        response, error = None, None
+        for future in as_completed(futures):
+            try:
+                response = future.result()
+            except (requests.exceptions.RequestException, RuntimeError, CircuitIsOpen) as e:
+                error = e
+                continue
+            if response.status_code < 500:
+                for other in futures:
+                    other.cancel()
+                return response, None
+        return response, error
+
+    def post(self, url, payload, stream=False):
+        """ Send payload to the best node and to the next ones while it fails.
+
+        :param url: Api url. Only the path is used. type(str)
+        :param payload: Jsonrpc request content. type(dict)
+        :param stream: Return as soon as the headers arrive and leave the body to be read. Not hedged. type(bool)
+
+        :return: response
+        """
+        response, error = None, None
+        nodes = self.rank_nodes(url)
+        if self.__executor is not None and len(nodes) > 1 and is_read_only(payload) and not stream:
+            response, error = self.post_hedged(nodes[0], nodes[1], url, payload)
+            if response is not None and response.status_code < 500:
+                return response
+            nodes = nodes[2:]
+        for node in nodes:
+            if response is not None:
+                response.close()
+            try:
+                response = self.post_to_node(node, url, payload, stream)
+            except (requests.exceptions.RequestException, RuntimeError, CircuitIsOpen) as e:
+                response, error = None, e
+                continue
+            if response.status_code < 500:
+                return response
+        if response is not None:
+            return response
+        raise error
+
+    def close(self):
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+        self.__transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class _Call(object):
+    """ A request in flight whose response is shared by the identical requests.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class CoalescingTransport(object):
+    """ Transport sharing one network call among identical read requests in flight,
+    with an optional short lived cache of the last block and balances.
+
+    Cached responses are dropped when a transaction is sent through this transport.
+    """
+
+    def __init__(self, transport=None, ttl=None, cached_methods=('icx_getLastBlock', 'icx_getBalance')):
+        """
+        :param transport: Transport sending the requests. The shared default transport is used when None.
+        :param ttl: Seconds to keep the responses of cached_methods. None disables the cache. type(float)
+        :param cached_methods: Methods whose responses are cached.
+        """
+        self.__transport = transport
+        self.__ttl = ttl
+        self.__cached_methods = frozenset(cached_methods)
+        self.__in_flight = {}
+        self.__cache = {}                       # key -> (expiry time, method, params, response)
+        self.__generation = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def transport(self):
+        return self.__transport if self.__transport is not None else get_default_transport()
+
+    def invalidate(self, addresses=()):
+        """ Drop the cached last blocks and the cached balances of the addresses.
+
+        :param addresses: Addresses whose balances changed.
+        """
+        addresses = set(addresses)
+        with self.__lock:
+            self.__generation += 1
+            for key, (_, method, params, _) in list(self.__cache.items()):
+                if method != 'icx_getBalance' or params.get('address') in addresses:
+                    del self.__cache[key]
+
+    def post(self, url, payload, stream=False):
+        """ Send payload to url, or wait for the identical request in flight.
+
+        :param url: Api url. type(str)
+        :param payload: Jsonrpc request content. type(dict)
+        :param stream: Return as soon as the headers arrive and leave the body to be read.
+                       A streamed body can't be shared, so the request is sent on its own. type(bool)
+
+        :return: response
+        """
+        if stream:
+            return self.transport.post(url, payload, stream=True)
+        if not isinstance(payload, dict) or not is_read_only(payload):
+            response = self.transport.post(url, payload)
+            if isinstance(payload, dict) and payload.get('method') == 'icx_sendTransaction':
+                params = payload.get('params', {})
+                self.invalidate([params.get('from'), params.get('to')])
+            return response
+
+        method = payload['method']
+        is_cached = self.__ttl is not None and method in self.__cached_methods
+        key = (url, json.dumps(payload, sort_keys=True))
+        with self.__lock:
+            if is_cached:
+                entry = self.__cache.get(key)
+                if entry is not None and entry[0] > time.monotonic():
+                    return entry[3]
+            call = self.__in_flight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self.__in_flight[key] = call
+                generation = self.__generation
+
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.response
+
+        try:
+            call.response = self.transport.post(url, payload)
+            return call.response
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.__lock:
+                del self.__in_flight[key]
+                # A response requested before an invalidation may be stale.
+                if is_cached and call.error is None and call.response.status_code == 200 \
+                        and generation == self.__generation:
+                    self.__cache[key] = (time.monotonic() + self.__ttl, method, payload.get('params', {}),
+                                         call.response)
+            call.event.set()
+
+    def close(self):
+        if self.__transport is not None:
+            self.__transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class AsyncHttpTransport(object):
+    """ Non-blocking HTTP transport for asyncio based on aiohttp.
+
+    The number of requests in flight is bounded by a semaphore so that thousands of
+    concurrent calls on one event loop don't open thousands of connections.
+    """
+
+    def __init__(self, max_concurrency=100, limit=100, verify=None, timeout=(3.05, 30.0)):
+        """
+        :param max_concurrency: Maximum number of requests in flight. type(int)
+        :param limit: Maximum number of connections kept in the pool. type(int)
+        :param verify: Path of the CA bundle. certifi's bundle is used by default. type(str)
+        :param timeout: (connect timeout, read timeout) in seconds. type(tuple)
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for AsyncHttpTransport. Install iconsdk[async].")
+        self.__max_concurrency = max_concurrency
+        self.__limit = limit
+        self.__timeout = timeout
+        self.__ssl_context = ssl.create_default_context(cafile=verify if verify is not None else certifi.where())
+        self.__session = None
+        self.__semaphore = None
+
+    async def post(self, url, payload):
+        """ Send payload to url as json.
+
+        :param url: Api url. type(str)
+        :param payload: Jsonrpc request content. type(dict)
+
+        :return: response content. type(dict)
+        """
+        # The session and the semaphore are bound to the running event loop, so they are created on first use.
+        if self.__session is None:
+            connector = aiohttp.TCPConnector(limit=self.__limit, ssl=self.__ssl_context)
+            connect_timeout, read_timeout = self.__timeout
+            timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+            self.__session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self.__semaphore = asyncio.Semaphore(self.__max_concurrency)
+        try:
+            async with self.__semaphore:
+                async with self.__session.post(url, data=dumps(payload), headers=_JSON_HEADERS) as response:
+                    return loads(await response.read())
+        except asyncio.TimeoutError:
+            raise RuntimeError("Timeout happened. Check your internet connection status.")
+
+    async def close(self):
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+_default_transport = None
+_default_transport_lock = threading.Lock()
+
+
+def get_default_transport():
+    """ Get the transport shared by the calls which are not given a transport.
+
+    :return: Instance of HttpTransport class.
+    """
+    global _default_transport
+    if _default_transport is None:
+        with _default_transport_lock:
+            if _default_transport is None:
+                _default_transport = HttpTransport()
+    return _default_transport
+
+
+def set_default_transport(transport):
+    """ Replace the transport shared by the calls which are not given a transport.
+
+    :param transport: Instance of HttpTransport class or None to create a new one lazily.
+    """
+    global _default_transport
+    with _default_transport_lock:
+        _default_transport = transport
@@ -15,12 +15,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import base64, hashlib, re, time, os, codecs, json, certifi, requests
-from eth_keyfile import create_keyfile_json, extract_key_from_keyfile, load_keyfile
-from json import JSONDecodeError
+import base64, binascii, hashlib, re, time, os, codecs, itertools, tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from eth_keyfile import extract_key_from_keyfile
 from icx.custom_error import NotEnoughBalanceInWallet, AmountIsInvalid, AddressIsWrong, TransferFeeIsInvalid, \
-    FeeIsBiggerThanAmount, NotAKeyStoreFile, AddressIsSame
-from icx.signer import IcxSigner
+    FeeIsBiggerThanAmount, NotAKeyStoreFile, AddressIsSame, ResponseIsInvalid
+from icx.signer import IcxSigner, get_signer, recover_public_key, public_key_to_address
+from icx.codec import loads
+from icx.transport import get_default_transport
+from icx.stream import StreamedBlock
+from icx.kdf import get_kdf_profile
+
+# Keys of a transaction which are not part of its tx_hash.
+TX_HASH_EXCLUDED_KEYS = ('tx_hash', 'signature', 'method')
+
+# The number of jsonrpc calls packed into one batch request.
+BATCH_SIZE = 100
+
+# Keys of the kdfparams of a keystore for each kdf.
+KDF_PARAMS_KEYS = {"pbkdf2": ["dklen", "salt", "c", "prf"], "scrypt": ["dklen", "salt", "n", "r", "p"]}
 
 
 def validate_password(password) -> bool:
@@ -72,25 +86,46 @@ def validate_key_store_file(key_store_file_path: object) -> bool:
     True: When the key_store_file was saved in valid format.
     False: When the key_store_file was saved in invalid format.
     """
+    load_key_store_file(key_store_file_path)
+    return True
+
+
+def validate_key_store_content(key_file) -> bool:
+    """ Check the parsed key_store file has the keys of the correct format.
+
+    :param key_file: Contents of key_store_file. type(dict)
+
+    :return: True when key_file is in valid format. Otherwise raise NotAKeyStoreFile.
+    """
     # The key values ​​that should be in the root location.
     root_keys = ["version", "id", "address", "crypto"]
     crypto_keys = ["ciphertext", "cipherparams", "cipher", "kdf", "kdfparams", "mac"]
     crypto_cipherparams_keys = ["iv"]
-    crypto_kdfparams_keys = ["dklen", "salt", "c", "prf"]
 
     try:
-        with open(key_store_file_path, 'rb') as key_store_file:
-            key_file = load_keyfile(key_store_file)
-        is_valid = has_keys(key_file, root_keys) and has_keys(key_file["crypto"], crypto_keys) and has_keys(key_file["crypto"]["cipherparams"], crypto_cipherparams_keys) and has_keys(key_file["crypto"]["kdfparams"], crypto_kdfparams_keys)
-    except KeyError:
-        raise NotAKeyStoreFile
-    except JSONDecodeError:
+        is_valid = has_keys(key_file, root_keys) and has_keys(key_file["crypto"], crypto_keys) and has_keys(key_file["crypto"]["cipherparams"], crypto_cipherparams_keys) and has_keys(key_file["crypto"]["kdfparams"], KDF_PARAMS_KEYS[key_file["crypto"]["kdf"]])
+    except (KeyError, TypeError):
         raise NotAKeyStoreFile
     if is_valid is not True:
         raise NotAKeyStoreFile
     return is_valid
 
 
+def load_key_store_file(key_store_file_path):
+    """ Read and parse the key_store file once, and check it is in the correct format.
+
+    :param key_store_file_path: File path for the keystore file of the wallet.
+
+    :return: Contents of key_store_file. type(dict)
+    """
+    try:
+        key_file = read_wallet(key_store_file_path)
+    except (ValueError, UnicodeDecodeError):
+        raise NotAKeyStoreFile
+    validate_key_store_content(key_file)
+    return key_file
+
+
 def validate_wallet_info(wallet_info: dict) -> bool:
     """ Check a wallet info has the right format or not.
 
@@ -102,11 +137,11 @@ def validate_wallet_info(wallet_info: dict) -> bool:
     root_keys = ["version", "id", "address", "crypto", "balance"]
     crypto_keys = ["ciphertext", "cipherparams", "cipher", "kdf", "kdfparams", "mac"]
     crypto_cipherparams_keys = ["iv"]
-    crypto_kdfparams_keys = ["dklen", "salt", "c", "prf"]
 
     is_valid = has_keys(wallet_info, root_keys) and has_keys(wallet_info["crypto"], crypto_keys) and \
                has_keys(wallet_info["crypto"]["cipherparams"], crypto_cipherparams_keys) and \
-               has_keys(wallet_info["crypto"]["kdfparams"], crypto_kdfparams_keys)
+               wallet_info["crypto"]["kdf"] in KDF_PARAMS_KEYS and \
+               has_keys(wallet_info["crypto"]["kdfparams"], KDF_PARAMS_KEYS[wallet_info["crypto"]["kdf"]])
     return is_valid
 
 
@@ -161,21 +196,26 @@ def get_address_by_privkey(privkey_bytes):
 
     :param privkey_bytes: Private key. type(string)
     """
-    account = IcxSigner.from_bytes(privkey_bytes)
+    account = get_signer(privkey_bytes)
     return f'hx{bytes_to_hex(account.address)}'
 
 
 def get_tx_hash(method, params):
     """ Create tx_hash from params object.
 
+    The pieces of the phrase are collected in one list and joined once, so the time is linear in the size
+    of params. It gives the same hash as sha3_256(get_tx_phrase(method, params).encode()).
+
     :param method: Method name. type(str)
     :param params: The value of 'params' key in jsonrpc.
 
     :return: bytes: sha3_256 hash value
     """
-
-    tx_phrase = get_tx_phrase(method, params)
-    return sha3_256(tx_phrase.encode())
+    if not params:
+        return sha3_256(method.encode())
+    pieces = [method, '.']
+    write_params_phrase(params, pieces.append)
+    return sha3_256(''.join(pieces).encode())
 
 
 def get_tx_phrase(method, params):
@@ -186,10 +226,7 @@ def get_tx_phrase(method, params):
 
     :return: sha3_256 hash format without '0x' prefix
     """
-    keys = [key for key in params]
-
-    key_count = len(keys)
-    if key_count == 0:
+    if not params:
         return method
 
     phrase = get_params_phrase(params)
@@ -200,40 +237,45 @@ def get_tx_phrase(method, params):
 def get_params_phrase(params):
     """Create params phrase recursively
     """
-    keys = [key for key in params]
-    keys.sort()
-    key_count = len(keys)
-    if key_count == 0:
-        return ""
-    phrase = ""
-
-    if isinstance(params[keys[0]], dict) is not True:
-        phrase += f'{keys[0]}.{params[keys[0]]}'
-    elif bool(params[keys[0]]) is not True:
-        phrase += f'{keys[0]}'
-    else:
-        phrase += f'{keys[0]}.{get_params_phrase(params[keys[0]])}'
+    pieces = []
+    write_params_phrase(params, pieces.append)
+    return ''.join(pieces)
 
-    for i in range(1, key_count):
-        key = keys[i]
 
-        if isinstance(params[key], dict) is not True:
-            phrase += f'.{key}.{params[key]}'
-        elif bool(params[key]) is not True:
-            phrase += f'.{key}'
-        else:
-            phrase += f'.{key}.{get_params_phrase(params[key])}'
+def write_params_phrase(params, write):
+    """ Write the params phrase piece by piece in the order of the sorted keys.
 
-    return phrase
+    The value of a key is written after the key and a '.', nested params are written recursively
+    and empty nested params are written as the key only.
+
+    :param params: The value of 'params' key in jsonrpc. type(dict)
+    :param write: Function taking each piece of the phrase. type(str)
+    """
+    is_first = True
+    for key in sorted(params):
+        if not is_first:
+            write('.')
+        is_first = False
+        write(f'{key}')
+
+        value = params[key]
+        if isinstance(value, dict):
+            if value:
+                write('.')
+                write_params_phrase(value, write)
+        else:
+            write('.')
+            write(f'{value}')
 
 
 def sign_recoverable(private_key_bytes, tx_hash_bytes):
     """
-    :param private_key_bytes: Byte private key value.
+    :param private_key_bytes: Byte private key value, or instance of IcxSigner class which is used instead of
+                              the cache of get_signer().
     :param tx_hash_bytes: 32 byte tx_hash data. type(bytes)
     :return: signature_bytes + recovery_id(1)
     """
-    signer = IcxSigner.from_bytes(private_key_bytes)
+    signer = private_key_bytes if isinstance(private_key_bytes, IcxSigner) else get_signer(private_key_bytes)
     signature_bytes, recovery_id = signer.sign_recoverable(tx_hash_bytes)
 
     # append recover_id(1 byte) to signature_bytes.
@@ -250,6 +292,36 @@ def sign(private_key_bytes, tx_hash_bytes):
     return base64.b64encode(recoverable_sig_bytes)
 
 
+def recover_address(tx):
+    """ Recover the address which signed the transaction.
+
+    :param tx: Params of icx_sendTransaction or a transaction of confirmed_transaction_list. type(dict)
+
+    :return: Address starting with 'hx'. type(str)
+    """
+    tx_hash_bytes = bytes.fromhex(tx['tx_hash'])
+    signature_bytes = base64.b64decode(tx['signature'])
+    return f'hx{bytes_to_hex(public_key_to_address(recover_public_key(tx_hash_bytes, signature_bytes)))}'
+
+
+def verify(tx, method='icx_sendTransaction'):
+    """ Check tx_hash of the transaction matches its params and the signature was made by 'from' address.
+
+    :param tx: Params of icx_sendTransaction or a transaction of confirmed_transaction_list. type(dict)
+    :param method: Method type. type(str)
+
+    :return: bool
+    """
+    try:
+        params = {key: value for key, value in tx.items() if key not in TX_HASH_EXCLUDED_KEYS}
+        if get_tx_hash(method, params).hex() != tx['tx_hash']:
+            return False
+        return recover_address(tx) == tx['from']
+    except (KeyError, TypeError, ValueError, binascii.Error):
+        # Missing or malformed fields and signatures the crypto backend can't recover from aren't valid.
+        return False
+
+
 def create_jsonrpc_request_content(_id, method, params):
 
     content = {
@@ -264,13 +336,46 @@ def create_jsonrpc_request_content(_id, method, params):
     return content
 
 
-def post(url, payload):
-    try:
-        path = certifi.where()
-        r = requests.post(url, json=payload, verify=path)
-        return r
-    except requests.exceptions.Timeout:
-        raise RuntimeError("Timeout happened. Check your internet connection status.")
+def post(url, payload, transport=None):
+    """ Send payload to url through the transport.
+
+    :param url: Api url. type(str)
+    :param payload: Jsonrpc request content. type(dict)
+    :param transport: Instance of HttpTransport class. The shared default transport is used when None.
+
+    :return: response
+    """
+    if transport is None:
+        transport = get_default_transport()
+    return transport.post(url, payload)
+
+
+def post_batch(url, method, params_list, transport=None, batch_size=BATCH_SIZE):
+    """ Send jsonrpc calls of the same method as batch requests.
+
+    Each call gets an unique id so that the replies are matched with the calls regardless of their order.
+
+    :param url: Api url. type(str)
+    :param method: Method name. type(str)
+    :param params_list: The value of 'params' key for each call. type(list)
+    :param transport: Instance of HttpTransport class.
+    :param batch_size: The maximum number of calls in one batch request. type(int)
+
+    :return: Reply of each call in the order of params_list. type(list)
+    """
+    replies = []
+    for start in range(0, len(params_list), batch_size):
+        chunk = params_list[start:start + batch_size]
+        payload = [create_jsonrpc_request_content(start + i, method, params) for i, params in enumerate(chunk)]
+        content = loads(post(url, payload, transport).content)
+        if not isinstance(content, list):
+            raise ResponseIsInvalid
+        replies_by_id = {reply.get('id'): reply for reply in content}
+        try:
+            replies.extend(replies_by_id[_id] for _id in range(start, start + len(chunk)))
+        except KeyError:
+            raise ResponseIsInvalid
+    return replies
 
 
 def get_payload_of_json_rpc_get_balance(address, url):
@@ -329,10 +434,10 @@ def change_hex_balance_to_decimal_balance(hex_balance, place=18):
         return result_decimal_icx
 
 
-def request_generator(url):
+def request_generator(url, transport=None):
     while True:
         payload = yield
-        yield post(url, payload)
+        yield post(url, payload, transport)
 
 
 def make_params(user_address, to, amount, fee, method, private_key_bytes):
@@ -343,17 +448,43 @@ def make_params(user_address, to, amount, fee, method, private_key_bytes):
     :param amount: Amount of money.
     :param fee: Transaction fee.
     :param method: Method type. type(str)
-    :param private_key_bytes: Private key of user's wallet.
+    :param private_key_bytes: Private key of user's wallet, or instance of IcxSigner class.
+
+    :return: type(dict)
+    """
+    params = make_unsigned_params(user_address, to, amount, fee)
+    return sign_params(method, params, private_key_bytes)
+
+
+def make_unsigned_params(user_address, to, amount, fee, timestamp=None):
+    """ Make params for jsonrpc format without tx_hash and signature.
+
+    :param user_address: Address of user's wallet.
+    :param to: Address of wallet to receive the asset.
+    :param amount: Amount of money.
+    :param fee: Transaction fee.
+    :param timestamp: Epoch time in us. The current time is used when None.
 
     :return: type(dict)
     """
-    params = {
+    return {
         'from': user_address,
         'to': to,
         'value': hex(amount),
         'fee': hex(fee),
-        'timestamp': str(get_timestamp_us())
+        'timestamp': str(get_timestamp_us() if timestamp is None else timestamp)
     }
+
+
+def sign_params(method, params, private_key_bytes):
+    """ Add tx_hash and signature to params.
+
+    :param method: Method type. type(str)
+    :param params: Params made by make_unsigned_params(). type(dict)
+    :param private_key_bytes: Private key of user's wallet, or instance of IcxSigner class.
+
+    :return: params. type(dict)
+    """
     tx_hash_bytes = get_tx_hash(method, params)
     signature_bytes = sign(private_key_bytes, tx_hash_bytes)
     params['tx_hash'] = tx_hash_bytes.hex()
@@ -375,16 +506,44 @@ def store_wallet(file_path, json_string):
         f.write(json_string)
 
 
-def make_key_store_content(password):
+def store_wallet_atomically(file_path, content, overwrite=False):
+    """ Store wallet information file so that the file is either complete or absent, even if the process dies.
+    The content is written to a temporary file of the same directory, which then takes the place of the file.
+
+    :param file_path: The path where the file will be saved. type: str
+    :param content: Contents of key_store_file. type(bytes)
+    :param overwrite: Replace the file if it exists. Otherwise raise FileExistsError. type(bool)
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    file_descriptor, temp_file_path = tempfile.mkstemp(prefix='.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(file_descriptor, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if overwrite:
+            os.replace(temp_file_path, file_path)
+        else:
+            # Unlike checking and then writing, a link fails if another writer made the file in the meantime.
+            os.link(temp_file_path, file_path)
+            os.remove(temp_file_path)
+    except BaseException:
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+        raise
+
+
+def make_key_store_content(password, kdf_profile=None):
     """ Make a content of key_store.
 
     :param password: Password including alphabet character, number, and special character.
+    :param kdf_profile: Instance of KdfProfile class. DEFAULT_KDF_PROFILE when None.
 
     :return: key_store_content(dict)
     """
     signer = IcxSigner()
     private_key = signer.private_key
-    key_store_contents = create_keyfile_json(private_key, bytes(password, 'utf-8'), iterations=262144)
+    key_store_contents = get_kdf_profile(kdf_profile).create_keyfile_json(private_key, password)
     icx_address = "hx" + signer.address.hex()
     key_store_contents['address'] = icx_address
     key_store_contents['coinType'] = 'icx'
@@ -402,11 +561,12 @@ def key_from_key_store(file_path, password):
     return private_key
 
 
-def get_balance(address, url):
+def get_balance(address, url, transport=None):
     """ Get balance of the address indicated by address.
 
     :param address: icx account address starting with 'hx'
     :param url: api target url
+    :param transport: Instance of HttpTransport class.
 
     :return: icx
     """
@@ -415,54 +575,185 @@ def get_balance(address, url):
     method = 'icx_getBalance'
     params = {'address': address}
     payload = create_jsonrpc_request_content(0, method, params)
-    response = post(url, payload)
-    content = response.json()
+    response = post(url, payload, transport)
+    content = loads(response.content)
     hex_balance = content['result']['response']
     dec_loop_balance = int(hex_balance, 16)
 
     return dec_loop_balance
 
 
-def get_block_by_hash(hash, url):
+def get_balances(addresses, url, transport=None, batch_size=BATCH_SIZE):
+    """ Get balances of the addresses with batch requests.
+
+    :param addresses: icx account addresses starting with 'hx'
+    :param url: api target url
+    :param transport: Instance of HttpTransport class.
+    :param batch_size: The maximum number of calls in one batch request. type(int)
+
+    :return: Balance of each address in the order of addresses. type(list)
+    The balance is None for an address whose reply is an error, so the other balances are kept.
+    """
+    url = f'{url}v2'
+
+    params_list = [{'address': address} for address in addresses]
+    replies = post_batch(url, 'icx_getBalance', params_list, transport, batch_size)
+    return [_get_balance_of_reply(reply) for reply in replies]
+
+
+def _get_balance_of_reply(reply):
+    try:
+        return int(reply['result']['response'], 16)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def get_block_by_hash(hash, url, transport=None, cache=None):
     """ Get block information by hash.
 
     :param hash: Using hash values ​​with electronic signatures. 64 character. hexadecimal.
     :param url: api target url
+    :param transport: Instance of HttpTransport class.
+    :param cache: Block cache of icx.cache. Blocks are served from and stored into it.
 
     :return: response result(json)
     """
+    if cache is not None:
+        block = cache.get_by_hash(hash)
+        if block is not None:
+            return block
+
     url = f'{url}v2'
 
     method = 'icx_getBlockByHash'
     params = {'hash': hash}
     payload = create_jsonrpc_request_content(0, method, params)
-    response = post(url, payload)
-    json_response = response.json()
+    response = post(url, payload, transport)
+    json_response = loads(response.content)
+    if cache is not None:
+        cache.put(json_response)
     return json_response
 
 
-def get_block_by_height(height, url):
+def get_block_by_height(height, url, transport=None, cache=None):
     """ Get block information by height.
 
     :param height: block's height
     :param url: api target url
+    :param transport: Instance of HttpTransport class.
+    :param cache: Block cache of icx.cache. Blocks are served from and stored into it.
 
     :return: response result(json)
     """
+    if cache is not None:
+        block = cache.get_by_height(height)
+        if block is not None:
+            return block
+
     url = f'{url}v2'
 
     method = 'icx_getBlockByHeight'
     params = {'height': height}
     payload = create_jsonrpc_request_content(0, method, params)
-    response = post(url, payload)
-    json_response = response.json()
+    response = post(url, payload, transport)
+    json_response = loads(response.content)
+    if cache is not None:
+        cache.put(json_response)
     return json_response
 
 
-def get_last_block(url):
+def stream_block_by_hash(hash, url, transport=None, chunk_size=65536):
+    """ Get block information by hash, parsing the transactions one by one while the response arrives.
+
+    :param hash: Using hash values with electronic signatures. 64 character. hexadecimal.
+    :param url: api target url
+    :param transport: Instance of HttpTransport class.
+    :param chunk_size: Bytes to read at once. type(int)
+
+    :return: Instance of StreamedBlock class. Iterate it to get the transactions.
+    """
+    url = f'{url}v2'
+
+    payload = create_jsonrpc_request_content(0, 'icx_getBlockByHash', {'hash': hash})
+    if transport is None:
+        transport = get_default_transport()
+    return StreamedBlock(transport.post(url, payload, stream=True), chunk_size)
+
+
+def stream_block_by_height(height, url, transport=None, chunk_size=65536):
+    """ Get block information by height, parsing the transactions one by one while the response arrives.
+
+    :param height: block's height
+    :param url: api target url
+    :param transport: Instance of HttpTransport class.
+    :param chunk_size: Bytes to read at once. type(int)
+
+    :return: Instance of StreamedBlock class. Iterate it to get the transactions.
+    """
+    url = f'{url}v2'
+
+    payload = create_jsonrpc_request_content(0, 'icx_getBlockByHeight', {'height': height})
+    if transport is None:
+        transport = get_default_transport()
+    return StreamedBlock(transport.post(url, payload, stream=True), chunk_size)
+
+
+def get_blocks_by_height(heights, url, transport=None, batch_size=BATCH_SIZE):
+    """ Get block information of the heights with batch requests.
+
+    :param heights: block heights. e.g. range(1, 101)
+    :param url: api target url
+    :param transport: Instance of HttpTransport class.
+    :param batch_size: The maximum number of calls in one batch request. type(int)
+
+    :return: response result(json) of each height in the order of heights. type(list)
+    """
+    url = f'{url}v2'
+
+    params_list = [{'height': height} for height in heights]
+    return post_batch(url, 'icx_getBlockByHeight', params_list, transport, batch_size)
+
+
+def iter_blocks_by_height(start, end, url, transport=None, workers=4, read_ahead=None, cache=None):
+    """ Fetch blocks from start to end - 1 concurrently and yield them in the order of height.
+
+    At most read_ahead blocks are requested ahead of the block the caller is consuming, so memory doesn't grow
+    with the size of the range. Give a transport whose pool_maxsize is not smaller than workers.
+
+    :param start: The first block height.
+    :param end: The block height to stop before.
+    :param url: api target url
+    :param transport: Instance of HttpTransport class.
+    :param workers: The number of threads sending requests. type(int)
+    :param read_ahead: The number of blocks requested in advance. workers * 2 by default. type(int)
+    :param cache: Block cache of icx.cache.
+
+    :return: generator of response result(json)
+    """
+    if read_ahead is None:
+        read_ahead = workers * 2
+    read_ahead = max(read_ahead, 1)
+
+    heights = iter(range(start, end))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque(executor.submit(get_block_by_height, height, url, transport, cache)
+                        for height in itertools.islice(heights, read_ahead))
+        try:
+            while pending:
+                block = pending.popleft().result()
+                for height in itertools.islice(heights, 1):
+                    pending.append(executor.submit(get_block_by_height, height, url, transport, cache))
+                yield block
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def get_last_block(url, transport=None):
     """ Get last block information.
 
     :param url: api target url
+    :param transport: Instance of HttpTransport class.
 
     :return: response result(json)
     """
@@ -471,8 +762,8 @@ def get_last_block(url):
     method = 'icx_getLastBlock'
     params = {}
     payload = create_jsonrpc_request_content(0, method, params)
-    response = post(url, payload)
-    json_response = response.json()
+    response = post(url, payload, transport)
+    json_response = loads(response.content)
     return json_response
 
 
@@ -485,9 +776,11 @@ def read_wallet(file_path):
     """
     if not os.path.isfile(file_path):
         raise FileNotFoundError
-    with codecs.open(file_path, 'r', 'utf-8-sig') as f:
-        wallet_info = json.load(f)
-        f.close()
+    with open(file_path, 'rb') as f:
+        content = f.read()
+    if content.startswith(codecs.BOM_UTF8):
+        content = content[len(codecs.BOM_UTF8):]
+    wallet_info = loads(content)
 
     return wallet_info
 
@@ -504,7 +797,7 @@ def get_balance_after_transfer(address, uri, request_gen):
     payload_for_balance = get_payload_of_json_rpc_get_balance(address, uri)
 
     next(request_gen)
-    balance_content = request_gen.send(payload_for_balance).json()
+    balance_content = loads(request_gen.send(payload_for_balance).content)
 
     balance = balance_content['result']['response']
     balance_loop = int(balance, 16)
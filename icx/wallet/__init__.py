@@ -15,3 +15,4 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from .wallet import Wallet
+from .async_wallet import AsyncWallet
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+from eth_keyfile import decode_keyfile_json
+from icx.async_utils import post, get_balance, get_block_by_hash, get_block_by_height, get_last_block
+from icx.custom_error import FilePathIsWrong, PasswordIsWrong
+from icx.signer import IcxSigner
+from icx.transport import AsyncHttpTransport
+from icx.utils import create_jsonrpc_request_content, validate_address, validate_address_is_not_same, \
+    check_amount_and_fee_is_valid, make_params, check_balance_enough
+from icx.wallet.wallet import Wallet, UNLOCK_TTL
+
+
+class AsyncWallet(Wallet):
+    """ Wallet whose network functions are coroutines.
+
+    Use the factories of Wallet and wrap the result with AsyncWallet.from_wallet().
+    """
+
+    def __init__(self, wallet_data: dict=None, public_key=None, uri="https://testwallet.icon.foundation/api/",
+                 address: str=None, transport=None):
+        super().__init__(wallet_data, public_key, uri, address,
+                         transport if transport is not None else AsyncHttpTransport())
+
+    @classmethod
+    def from_wallet(cls, wallet, transport=None):
+        """ make an async wallet with the information of the wallet
+
+            :param wallet: Instance of Wallet class.
+            :param transport: Instance of AsyncHttpTransport class.
+
+            :return: Instance of AsyncWallet class.
+        """
+        return cls(wallet.wallet_info, wallet.public_key, wallet.uri, transport=transport)
+
+    async def transfer_value(self, password, to_address, value, fee=10000000000000000,
+                             uri='https://testwallet.icon.foundation/api/', hex_private_key=None, **kwargs):
+        """ transfer the specific value with private key
+
+            :param password:  Password including alphabet character, number, and special character.
+                              Not used while the wallet is unlocked.
+            :param to_address: Address of wallet to receive the asset.
+            :param value: Amount of money.
+            :param fee: Transaction fee.
+            :param uri: Api url. type(str)
+            :param hex_private_key: the private key with a hexadecimal number
+
+            :return: response content. type(dict)
+        """
+        try:
+            # A signer of its own rather than get_signer(), so the key doesn't stay in the cache of signers.
+            signer = self._get_unlocked_signer()
+            if signer is None:
+                # The key derivation takes hundreds of milliseconds, so it must not block the event loop.
+                loop = asyncio.get_event_loop()
+                byte_private_key = await loop.run_in_executor(
+                    None, decode_keyfile_json, self.wallet_info, bytes(password, 'utf-8'))
+                signer = IcxSigner.from_bytes(byte_private_key)
+
+            validate_address(to_address)
+            validate_address(self.address)
+            validate_address_is_not_same(to_address, self.address)
+
+            method = 'icx_sendTransaction'
+            value, fee = int(value), int(fee)
+
+            check_amount_and_fee_is_valid(value, fee)
+
+            params = make_params(self.address, to_address, value, fee, method, signer)
+            payload = create_jsonrpc_request_content(0, method, params)
+
+            balance = await get_balance(self.address, uri, self.transport)
+            check_balance_enough(balance, value, fee)
+            return await post(f'{uri}v2', payload, self.transport)
+        except FileNotFoundError:
+            raise FilePathIsWrong
+        except IsADirectoryError:
+            raise FilePathIsWrong
+        except ValueError:
+            raise PasswordIsWrong
+
+    async def unlock(self, password, ttl=UNLOCK_TTL):
+        """ decrypt the private key once in an executor and keep it in memory for ttl seconds.
+
+            :param password:  Password including alphabet character, number, and special character.
+            :param ttl: Seconds to keep the private key. type(float)
+        """
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, super().unlock, password, ttl)
+
+    async def get_wallet_info(self, uri="https://testwallet.icon.foundation/api/"):
+        """ get the keystore file information and the balance
+
+            :param uri type(str)
+
+            :return wallet information. type(dict)
+        """
+        balance = await get_balance(self.address, uri, self.transport)
+        self.wallet_info['balance'] = balance
+        return self.wallet_info
+
+    async def get_balance(self, uri="https://testwallet.icon.foundation/api/"):
+        """ get the balance
+
+            :param uri type(str)
+
+            :return balance. type(int)
+        """
+        return await get_balance(self.address, uri, self.transport)
+
+    async def close(self):
+        await self.transport.close()
+
+    @classmethod
+    async def get_block_by_height(cls, height, uri="https://testwallet.icon.foundation/api/", transport=None):
+        """ get block information by height
+
+        :param height:
+        :param uri type(str)
+        :param transport: Instance of AsyncHttpTransport class. A temporary one is used when None.
+        :return:
+        """
+        if transport is None:
+            async with AsyncHttpTransport() as transport:
+                return await get_block_by_height(height, uri, transport)
+        return await get_block_by_height(height, uri, transport)
+
+    @classmethod
+    async def get_block_by_hash(cls, hash, uri="https://testwallet.icon.foundation/api/", transport=None):
+        """ get block information by hash
+
+        :param hash:
+        :param uri:
+        :param transport: Instance of AsyncHttpTransport class. A temporary one is used when None.
+        :return:
+        """
+        if transport is None:
+            async with AsyncHttpTransport() as transport:
+                return await get_block_by_hash(hash, uri, transport)
+        return await get_block_by_hash(hash, uri, transport)
+
+    @classmethod
+    async def get_last_block(cls, uri="https://testwallet.icon.foundation/api/", transport=None):
+        """ get last block information
+
+        :param uri:
+        :param transport: Instance of AsyncHttpTransport class. A temporary one is used when None.
+        :return:
+        """
+        if transport is None:
+            async with AsyncHttpTransport() as transport:
+                return await get_last_block(uri, transport)
+        return await get_last_block(uri, transport)
@@ -15,26 +15,50 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-
-from eth_keyfile import create_keyfile_json, decode_keyfile_json
+import threading
+import time
+import weakref
+from eth_keyfile import decode_keyfile_json
 from icx.custom_error import PasswordIsNotAcceptable, FileExists, NoPermissionToWriteFile, FilePathIsWrong, \
     FilePathWithoutFileName, PasswordIsWrong
 from icx.utils import validate_password, create_jsonrpc_request_content, \
-        store_wallet, validate_key_store_file, read_wallet, \
+        store_wallet, load_key_store_file, \
         get_balance, validate_address, validate_address_is_not_same, check_amount_and_fee_is_valid, make_params, \
-        request_generator, get_balance_after_transfer, check_balance_enough, key_from_key_store, \
-        get_last_block, get_block_by_hash, get_block_by_height
+        request_generator, get_balance_after_transfer, check_balance_enough, \
+        get_last_block, get_block_by_hash, get_block_by_height, get_balances, get_blocks_by_height, \
+        iter_blocks_by_height, stream_block_by_height, stream_block_by_hash
 from icx.signer import IcxSigner
+from icx.codec import dumps
+from icx.kdf import get_kdf_profile
+
+# Seconds for which Wallet.unlock() keeps the private key by default.
+UNLOCK_TTL = 300
+
+
+def _wipe(private_key):
+    private_key[:] = bytes(len(private_key))
+
+
+def _lock_wallet(wallet_ref):
+    wallet = wallet_ref()
+    if wallet is not None:
+        wallet.lock()
 
 
 class Wallet:
 
-    def __init__(self, wallet_data: dict=None, public_key=None, uri="https://testwallet.icon.foundation/api/", address: str=None):
+    def __init__(self, wallet_data: dict=None, public_key=None, uri="https://testwallet.icon.foundation/api/", address: str=None,
+                 transport=None):
         self.__wallet_info = wallet_data
         self.__address = self.__wallet_info["address"]                                      # an address of the wallet
         self.__public_key = public_key                                                      # a public key of the wallet
         self.__uri = uri                                                                    # a target uri for api
+        self.__transport = transport                                                        # a shared http transport
+        self.__unlocked_key = None                                                          # a private key of unlock()
+        self.__unlock_finalizer = None
+        self.__unlock_deadline = None
+        self.__unlock_timer = None
+        self.__unlock_lock = threading.Lock()
 
     @property
     def address(self):
@@ -52,6 +76,10 @@ class Wallet:
     def uri(self):
         return self.__uri
 
+    @property
+    def transport(self):
+        return self.__transport
+
     @address.setter
     def address(self, address):
         self.__address = address
@@ -68,12 +96,77 @@ class Wallet:
     def uri(self, uri):
         self.__uri = uri
 
+    @transport.setter
+    def transport(self, transport):
+        self.__transport = transport
+
+    @property
+    def is_unlocked(self):
+        return self._get_unlocked_signer() is not None
+
+    def unlock(self, password, ttl=UNLOCK_TTL):
+        """ decrypt the private key once and keep it in memory for ttl seconds.
+        Until it expires or lock() is called, transfer_value() skips the key derivation of the keystore.
+
+            :param password:  Password including alphabet character, number, and special character.
+            :param ttl: Seconds to keep the private key. type(float)
+        """
+        try:
+            private_key_bytes = decode_keyfile_json(self.wallet_info, bytes(password, 'utf-8'))
+        except ValueError:
+            raise PasswordIsWrong
+        self.__set_unlocked_key(bytearray(private_key_bytes), ttl)
+
+    def __set_unlocked_key(self, private_key, ttl):
+        # The timer refers to the wallet weakly not to keep it alive until the time is over.
+        timer = threading.Timer(ttl, _lock_wallet, (weakref.ref(self),))
+        timer.daemon = True
+        with self.__unlock_lock:
+            self.__wipe_unlocked_key()
+            self.__unlocked_key = private_key
+            # The key is wiped also when the wallet is collected while unlocked.
+            self.__unlock_finalizer = weakref.finalize(self, _wipe, private_key)
+            self.__unlock_deadline = time.monotonic() + ttl
+            self.__unlock_timer = timer
+        timer.start()
+
+    def lock(self):
+        """ wipe the private key kept by unlock().
+        """
+        with self.__unlock_lock:
+            self.__wipe_unlocked_key()
+
+    def __wipe_unlocked_key(self):
+        if self.__unlock_timer is not None:
+            self.__unlock_timer.cancel()
+            self.__unlock_timer = None
+        if self.__unlock_finalizer is not None:
+            # Overwrite the key with zeros. The copies made by decode_keyfile_json() and by the signer of
+            # each transfer are immutable bytes, which are only released.
+            self.__unlock_finalizer()
+            self.__unlock_finalizer = None
+        self.__unlocked_key = None
+        self.__unlock_deadline = None
+
+    def _get_unlocked_signer(self):
+        """ get a new signer of the private key kept by unlock(), or None when the wallet is locked or the key expired.
+        The signer isn't in the cache of get_signer(), so the key is released with the signer.
+        """
+        with self.__unlock_lock:
+            if self.__unlocked_key is None:
+                return None
+            if time.monotonic() >= self.__unlock_deadline:
+                self.__wipe_unlocked_key()
+                return None
+            return IcxSigner.from_bytes(bytes(self.__unlocked_key))
+
     @staticmethod
-    def create_keystore_file_of_wallet(keystore_file_path, password):
+    def create_keystore_file_of_wallet(keystore_file_path, password, kdf_profile=None):
         """ create both a wallet and a keystore file
 
            :param keystore_file_path: File path for the keystore file of the wallet.
            :param password:  Password including alphabet character, number, and special character.
+           :param kdf_profile: Instance of KdfProfile class. DEFAULT_KDF_PROFILE when None.
 
            :return: Instance of Wallet class.
         """
@@ -84,10 +177,10 @@ class Wallet:
             signer = IcxSigner()
             byte_private_key = signer.private_key_bytes
 
-            key_store_contents = create_keyfile_json(byte_private_key, bytes(password, 'utf-8'), iterations=262144)
+            key_store_contents = get_kdf_profile(kdf_profile).create_keyfile_json(byte_private_key, password)
             key_store_contents['address'] = "hx" + signer.address.hex()
             key_store_contents['coinType'] = 'icx'
-            json_string_keystore_data = json.dumps(key_store_contents)
+            json_string_keystore_data = dumps(key_store_contents).decode('utf-8')
             store_wallet(keystore_file_path, json_string_keystore_data)
 
             wallet = Wallet(key_store_contents)
@@ -103,11 +196,12 @@ class Wallet:
             raise FilePathWithoutFileName
 
     @staticmethod
-    def create_wallet_by_private_key(password, hex_private_key=None):
+    def create_wallet_by_private_key(password, hex_private_key=None, kdf_profile=None):
         """ create wallet without keystore file
 
            :param hex_private_key: the private key with a hexadecimal number
            :param password
+           :param kdf_profile: Instance of KdfProfile class. DEFAULT_KDF_PROFILE when None.
 
            :return: Instance of Wallet class.
            """
@@ -116,7 +210,7 @@ class Wallet:
 
             signer = IcxSigner(bytes.fromhex(hex_private_key) if hex_private_key else None, True if hex_private_key else None)
 
-            key_store_contents = create_keyfile_json(signer.private_key_bytes, bytes(password, 'utf-8'), iterations=262144)
+            key_store_contents = get_kdf_profile(kdf_profile).create_keyfile_json(signer.private_key_bytes, password)
             key_store_contents['address'] = "hx" + signer.address.hex()
             key_store_contents['coinType'] = 'icx'
 
@@ -141,9 +235,9 @@ class Wallet:
             raise PasswordIsNotAcceptable
 
         try:
-            validate_key_store_file(keystore_file_path)
-            private_key_bytes = key_from_key_store(keystore_file_path, bytes(password, 'utf-8'))
-            wallet = Wallet(read_wallet(keystore_file_path))
+            wallet_info = load_key_store_file(keystore_file_path)
+            private_key_bytes = decode_keyfile_json(wallet_info, bytes(password, 'utf-8'))
+            wallet = Wallet(wallet_info)
             return_value = (wallet, private_key_bytes.hex())
             return return_value
         except FileNotFoundError:
@@ -156,6 +250,7 @@ class Wallet:
         """ transfer the specific value with private key
 
             :param password:  Password including alphabet character, number, and special character.
+                              Not used while the wallet is unlocked.
             :param to_address: Address of wallet to receive the asset.
             :param value: Amount of money.
             :param fee: Transaction fee.
@@ -167,7 +262,10 @@ class Wallet:
         try:
 
             uri = f'{uri}v2'
-            byte_private_key = decode_keyfile_json(self.wallet_info, bytes(password, 'utf-8'))
+            # A signer of its own rather than get_signer(), so the key doesn't stay in the cache of signers.
+            signer = self._get_unlocked_signer()
+            if signer is None:
+                signer = IcxSigner.from_bytes(decode_keyfile_json(self.wallet_info, bytes(password, 'utf-8')))
 
             validate_address(to_address)
             validate_address(self.address)
@@ -178,11 +276,11 @@ class Wallet:
 
             check_amount_and_fee_is_valid(value, fee)
 
-            params = make_params(self.address, to_address, value, fee, method, byte_private_key)
+            params = make_params(self.address, to_address, value, fee, method, signer)
             payload = create_jsonrpc_request_content(0, method, params)
 
             # Request the balance repeatedly until we get the response from ICON network.
-            request_gen = request_generator(uri)
+            request_gen = request_generator(uri, self.transport)
             balance = get_balance_after_transfer(self.address, uri, request_gen)
             check_balance_enough(balance, value, fee)
             next(request_gen)
@@ -202,7 +300,7 @@ class Wallet:
 
             :return wallet information. type(dict)
         """
-        balance = get_balance(self.address, uri)
+        balance = get_balance(self.address, uri, self.transport)
         self.wallet_info['balance'] = balance
         return self.wallet_info
 
@@ -213,44 +311,113 @@ class Wallet:
 
             :return wallet information. type(dict)
         """
-        balance = get_balance(self.address, uri)
+        balance = get_balance(self.address, uri, self.transport)
 
         return balance
 
+    @classmethod
+    def get_balances(cls, addresses, uri="https://testwallet.icon.foundation/api/", transport=None):
+        """ get the balances of many addresses with batch requests
+
+            :param addresses: list of addresses starting with 'hx'
+            :param uri type(str)
+            :param transport: Instance of HttpTransport class.
+
+            :return list of balances in the order of addresses.
+            The balance is None for an address whose reply is an error.
+        """
+        return get_balances(addresses, uri, transport)
+
     def get_address(self):
         """ get the address
         """
         return self.address
 
     @classmethod
-    def get_block_by_height(cls, height, uri="https://testwallet.icon.foundation/api/"):
+    def get_block_by_height(cls, height, uri="https://testwallet.icon.foundation/api/", transport=None,
+                            cache=None):
         """ get block information by height
 
         :param height:
         :param uri type(str)
+        :param transport: Instance of HttpTransport class.
+        :param cache: Block cache of icx.cache.
         :return:
         """
-        block = get_block_by_height(height, uri)
+        block = get_block_by_height(height, uri, transport, cache)
         return block
 
     @classmethod
-    def get_block_by_hash(cls, hash, uri="https://testwallet.icon.foundation/api/"):
+    def get_blocks_by_height(cls, heights, uri="https://testwallet.icon.foundation/api/", transport=None):
+        """ get block information of many heights with batch requests
+
+        :param heights: block heights. e.g. range(1, 101)
+        :param uri type(str)
+        :param transport: Instance of HttpTransport class.
+        :return: list of blocks in the order of heights.
+        """
+        blocks = get_blocks_by_height(heights, uri, transport)
+        return blocks
+
+    @classmethod
+    def get_blocks(cls, start, end, workers=4, read_ahead=None, uri="https://testwallet.icon.foundation/api/",
+                   transport=None, cache=None):
+        """ get blocks from start to end - 1 concurrently in the order of height
+
+        :param start: the first block height
+        :param end: the block height to stop before
+        :param workers: the number of requests sent concurrently
+        :param read_ahead: the number of blocks fetched in advance. workers * 2 by default.
+        :param uri type(str)
+        :param transport: Instance of HttpTransport class.
+        :param cache: Block cache of icx.cache.
+        :return: generator of blocks
+        """
+        return iter_blocks_by_height(start, end, uri, transport, workers, read_ahead, cache)
+
+    @classmethod
+    def stream_block_by_height(cls, height, uri="https://testwallet.icon.foundation/api/", transport=None):
+        """ get block information by height parsing the transactions one by one
+
+        :param height:
+        :param uri type(str)
+        :param transport: Instance of HttpTransport class.
+        :return: Instance of StreamedBlock class. Iterate it to get the transactions.
+        """
+        return stream_block_by_height(height, uri, transport)
+
+    @classmethod
+    def stream_block_by_hash(cls, hash, uri="https://testwallet.icon.foundation/api/", transport=None):
+        """ get block information by hash parsing the transactions one by one
+
+        :param hash:
+        :param uri type(str)
+        :param transport: Instance of HttpTransport class.
+        :return: Instance of StreamedBlock class. Iterate it to get the transactions.
+        """
+        return stream_block_by_hash(hash, uri, transport)
+
+    @classmethod
+    def get_block_by_hash(cls, hash, uri="https://testwallet.icon.foundation/api/", transport=None, cache=None):
         """ get block information by hash
 
         :param hash:
         :param uri:
+        :param transport: Instance of HttpTransport class.
+        :param cache: Block cache of icx.cache.
         :return:
         """
-        block = get_block_by_hash(hash, uri)
+        block = get_block_by_hash(hash, uri, transport, cache)
         return block
 
     @classmethod
-    def get_last_block(cls, uri="https://testwallet.icon.foundation/api/"):
+    def get_last_block(cls, uri="https://testwallet.icon.foundation/api/", transport=None):
         """ get last block information
 
         :param uri:
+        :param transport: Instance of HttpTransport class.
         :return:
         """
-        last_block = get_last_block(uri)
+        last_block = get_last_block(uri, transport)
         return last_block
 
@@ -20,7 +20,9 @@ def find_version(*file_paths):
     raise RuntimeError("Unable to find version string.")
 
 
-requires = ['requests>=2.20.0', "eth-keyfile==0.5.1", "secp256k1==0.13.2", "certifi==2018.4.16"]
+requires = ['requests>=2.20.0', "eth-keyfile==0.5.1", "eth-keys", "certifi==2018.4.16"]
+extras_requires = {'async': ['aiohttp>=3.0'], 'fast': ['orjson'], 'secp256k1': ['secp256k1==0.13.2'],
+                   'coincurve': ['coincurve']}
 
 setup_options = {
     'name': 'iconsdk', 'version': find_version("icx", "__init__.py"),
@@ -33,6 +35,7 @@ setup_options = {
     'package_data': {'iconsdk': 'README.rst'},
     'license': "Apache License 2.0",
     'install_requires': requires,
+    'extras_require': extras_requires,
     'classifiers': [
         'Development Status :: 5 - Production/Stable',
         'Intended Audience :: Developers',
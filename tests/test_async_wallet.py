@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import unittest
+from icx.transport import AsyncHttpTransport
+from icx.wallet import Wallet, AsyncWallet
+from tests.local_node import LocalNode
+
+
+def respond(payload):
+    if payload['method'] == 'icx_getBalance':
+        return {'jsonrpc': '2.0', 'id': payload['id'], 'result': {'response_code': 0, 'response': '0x10'}}
+    return {'jsonrpc': '2.0', 'id': payload['id'], 'result': {'response_code': 0, 'block': {'height': 7}}}
+
+
+class TestAsyncWallet(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test0(self):
+        """ Case to get balances concurrently on one event loop.
+        """
+        # Given
+        wallet, _ = Wallet.create_wallet_by_private_key(
+            'password1234*', "df7784bc856bc3e96d5b2733957ea0a47ff39d60aaf8a3406a74b8580e8395cc")
+
+        async def get_balances(uri):
+            async_wallet = AsyncWallet.from_wallet(wallet, AsyncHttpTransport(max_concurrency=5))
+            try:
+                return await asyncio.gather(*[async_wallet.get_balance(uri) for _ in range(50)])
+            finally:
+                await async_wallet.close()
+
+        with LocalNode(respond) as node:
+            # When
+            balances = self.loop.run_until_complete(get_balances(node.uri))
+
+        # Then
+        self.assertEqual([16] * 50, balances)
+        self.assertLessEqual(node.connection_count, 5)
+
+    def test1(self):
+        """ Case to get last block without a transport.
+        """
+        # Given
+        with LocalNode(respond) as node:
+            # When
+            last_block = self.loop.run_until_complete(AsyncWallet.get_last_block(node.uri))
+
+        # Then
+        self.assertEqual(7, last_block['result']['block']['height'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from icx.custom_error import ResponseIsInvalid
+from icx.transport import HttpTransport
+from icx.wallet import Wallet
+from tests.local_node import LocalNode
+
+
+def reply(call):
+    if call['method'] == 'icx_getBalance':
+        result = {'response_code': 0, 'response': hex(int(call['params']['address'][2:], 16))}
+    else:
+        result = {'response_code': 0, 'block': {'height': call['params']['height']}}
+    return {'jsonrpc': '2.0', 'id': call['id'], 'result': result}
+
+
+def respond(payload):
+    # Reply in the reverse order to check the replies are matched by id.
+    return [reply(call) for call in reversed(payload)]
+
+
+class TestBatchRequest(unittest.TestCase):
+
+    def test0(self):
+        """ Case to get balances of many addresses in a few requests.
+        """
+        # Given
+        addresses = [f'hx{i:040x}' for i in range(250)]
+
+        with LocalNode(respond) as node, HttpTransport() as transport:
+            # When
+            balances = Wallet.get_balances(addresses, node.uri, transport)
+
+        # Then
+        self.assertEqual(list(range(250)), balances)
+        self.assertEqual(3, node.request_count)
+
+    def test1(self):
+        """ Case to get blocks of a range of heights.
+        """
+        # Given
+        with LocalNode(respond) as node, HttpTransport() as transport:
+            # When
+            blocks = Wallet.get_blocks_by_height(range(10, 20), node.uri, transport)
+
+        # Then
+        self.assertEqual(list(range(10, 20)), [block['result']['block']['height'] for block in blocks])
+
+    def test2(self):
+        """ Case when a reply is missing in the batch response.
+        """
+        # Given
+        with LocalNode(lambda payload: [reply(call) for call in payload[1:]]) as node, HttpTransport() as transport:
+            # When
+            try:
+                Wallet.get_blocks_by_height(range(3), node.uri, transport)
+
+            # Then
+            except ResponseIsInvalid:
+                self.assertTrue(True)
+            else:
+                self.assertTrue(False)
+
+    def test3(self):
+        """ Case that an error reply in the batch response gives None only for its address.
+        """
+        # Given
+        addresses = [f'hx{i:040x}' for i in range(5)]
+
+        def respond_with_errors(payload):
+            replies = [reply(call) for call in payload]
+            replies[1] = {'jsonrpc': '2.0', 'id': payload[1]['id'], 'error': {'code': -32000, 'message': 'error'}}
+            replies[3]['result'] = {'response_code': -1, 'message': 'error'}
+            return replies
+
+        with LocalNode(respond_with_errors) as node, HttpTransport() as transport:
+            # When
+            balances = Wallet.get_balances(addresses, node.uri, transport)
+
+        # Then
+        self.assertEqual([0, None, 2, None, 4], balances)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from icx.cache import MemoryBlockCache, DiskBlockCache, TieredBlockCache
+from icx.transport import HttpTransport
+from icx.wallet import Wallet
+from tests.local_node import LocalNode
+
+
+def make_block(height):
+    return {'jsonrpc': '2.0', 'id': 0,
+            'result': {'response_code': 0, 'block': {'height': height, 'block_hash': f'{height:064x}'}}}
+
+
+def respond(payload):
+    if payload['method'] == 'icx_getBlockByHash':
+        return make_block(int(payload['params']['hash'], 16))
+    return make_block(payload['params']['height'])
+
+
+class TestBlockCache(unittest.TestCase):
+
+    def test0(self):
+        """ Case that a block fetched by height is served by hash from the cache.
+        """
+        # Given
+        cache = MemoryBlockCache()
+
+        with LocalNode(respond) as node, HttpTransport() as transport:
+            # When
+            block1 = Wallet.get_block_by_height(3, node.uri, transport, cache)
+            block2 = Wallet.get_block_by_hash(f'0x{3:064X}', node.uri, transport, cache)
+            block3 = Wallet.get_block_by_height(3, node.uri, transport, cache)
+
+        # Then
+        self.assertEqual(block1, block2)
+        self.assertEqual(block1, block3)
+        self.assertEqual(1, node.request_count)
+
+    def test1(self):
+        """ Case that the least recently used block is evicted.
+        """
+        # Given
+        cache = MemoryBlockCache(max_size=2)
+
+        # When
+        cache.put(make_block(1))
+        cache.put(make_block(2))
+        cache.get_by_height(1)
+        cache.put(make_block(3))
+
+        # Then
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get_by_height(2))
+        self.assertIsNone(cache.get_by_hash(f'{2:064x}'))
+        self.assertEqual(make_block(1), cache.get_by_height(1))
+
+    def test2(self):
+        """ Case that blocks stored on disk survive the cache and are promoted to memory.
+        """
+        # Given
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'blocks.db')
+            disk_cache = DiskBlockCache(file_path)
+            disk_cache.put(make_block(5))
+            disk_cache.put({'jsonrpc': '2.0', 'id': 0, 'result': {'response_code': -1}})
+            disk_cache.close()
+
+            # When
+            memory_cache = MemoryBlockCache()
+            disk_cache = DiskBlockCache(file_path)
+            cache = TieredBlockCache(memory_cache, disk_cache)
+            block = cache.get_by_hash(f'{5:064x}')
+            disk_cache.close()
+
+        # Then
+        self.assertEqual(make_block(5), block)
+        self.assertEqual(make_block(5), memory_cache.get_by_height(5))
+
+    def test3(self):
+        """ Case that a block replaced at its height isn't found by its hash any more.
+        """
+        # Given
+        cache = MemoryBlockCache()
+        cache.put(make_block(7))
+        replacing_block = make_block(7)
+        replacing_block['result']['block']['block_hash'] = f'{8:064x}'
+
+        # When
+        cache.put(replacing_block)
+
+        # Then
+        self.assertIsNone(cache.get_by_hash(f'{7:064x}'))
+        self.assertEqual(replacing_block, cache.get_by_hash(f'{8:064x}'))
+        self.assertEqual(replacing_block, cache.get_by_height(7))
+        self.assertEqual(1, len(cache))
+
+    def test4(self):
+        """ Case that changing a block put in or got from the cache doesn't change the cached block.
+        """
+        # Given
+        cache = MemoryBlockCache()
+        block = make_block(9)
+        cache.put(block)
+
+        # When
+        block['result']['block']['height'] = 10
+        cache.get_by_height(9)['result']['response_code'] = -1
+        cache.get_by_hash(f'{9:064x}')['result']['block']['block_hash'] = ''
+
+        # Then
+        self.assertEqual(make_block(9), cache.get_by_height(9))
+
+
+if __name__ == "__main__":
+    unittest.main()
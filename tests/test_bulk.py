@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+from icx.bulk import sign_many, verify_many, derive_addresses, create_keystore_files, unlock_many, \
+    reencrypt_keystores, REENCRYPTED, ALREADY_REENCRYPTED
+from icx.custom_error import KeystoreIsNotUnlocked, PasswordIsWrong, FilePathIsWrong, NotAKeyStoreFile, \
+    AddressIsWrong, KeystoreIsNotReencrypted
+from icx.kdf import KdfProfile, LOW_COST_KDF_PROFILE
+from icx.reencrypt import main
+from icx.utils import make_unsigned_params, sign_params, verify, recover_address, get_address_by_privkey, \
+    store_wallet_atomically, load_key_store_file
+from icx.wallet import Wallet
+
+private_key_bytes = bytes.fromhex("df7784bc856bc3e96d5b2733957ea0a47ff39d60aaf8a3406a74b8580e8395cc")
+address = "hx66425784bfddb5b430136b38268c3ce1fb68e8c5"
+TEST_DIR = os.path.dirname(os.path.abspath("tests/keystore_file/not_a_key_store_file.txt"))
+
+
+class TestBulk(unittest.TestCase):
+
+    def test_sign_many(self):
+        """ Case to sign transactions across processes in the input order.
+        """
+        # Given
+        params_list = [make_unsigned_params(address, f'hx{i:040x}', 10 ** 18 + i, 10 ** 16, 1530000000000000 + i)
+                       for i in range(100)]
+
+        # When
+        signed_params_list = list(sign_many(private_key_bytes, params_list, processes=2, chunk_size=7))
+
+        # Then
+        expect = [sign_params('icx_sendTransaction', dict(params), private_key_bytes) for params in params_list]
+        self.assertEqual(expect, signed_params_list)
+        self.assertNotIn('signature', params_list[0])
+
+    def test_sign_many_read_ahead(self):
+        """ Case that params are taken from the input only a bounded number of chunks ahead of the consumer.
+        """
+        # Given
+        consumed = []
+
+        def params_list():
+            for i in range(10000):
+                consumed.append(i)
+                yield make_unsigned_params(address, f'hx{i:040x}', 10 ** 18, 10 ** 16, 1530000000000000 + i)
+
+        # When
+        signed_params_list = sign_many(private_key_bytes, params_list(), processes=2, chunk_size=4, read_ahead=3)
+        next(signed_params_list)
+        time.sleep(0.2)
+        consumed_count = len(consumed)
+        signed_params_list.close()
+
+        # Then
+        self.assertLessEqual(consumed_count, 4 * (3 + 1) + 1)
+
+    def test_verify(self):
+        """ Case to recover the address of a signed transaction and to reject a tampered one.
+        """
+        # Given
+        params = sign_params('icx_sendTransaction', make_unsigned_params(address, f'hx{1:040x}', 10 ** 18, 10 ** 16),
+                             private_key_bytes)
+        tampered_params = dict(params, value=hex(10 ** 19))
+        confirmed_tx = dict(params, method='icx_sendTransaction')
+
+        # When, Then
+        self.assertEqual(address, recover_address(params))
+        self.assertTrue(verify(params))
+        self.assertTrue(verify(confirmed_tx))
+        self.assertFalse(verify(tampered_params))
+        self.assertFalse(verify(dict(params, signature='AAAA')))
+        self.assertFalse(verify(dict(params, signature='A' * 88)))
+        self.assertFalse(verify(dict(params, tx_hash=None)))
+        self.assertRaises(AttributeError, verify, list(params))
+
+    def test_verify_many(self):
+        """ Case to verify transactions across processes in the input order.
+        """
+        # Given
+        params_list = [make_unsigned_params(address, f'hx{i:040x}', 10 ** 18, 10 ** 16, 1530000000000000 + i)
+                       for i in range(50)]
+        txs = list(sign_many(private_key_bytes, params_list, processes=1))
+        txs[7] = dict(txs[7], to=f'hx{99:040x}')
+
+        # When
+        results = list(verify_many(txs, processes=2, chunk_size=4))
+
+        # Then
+        self.assertEqual([i != 7 for i in range(50)], results)
+
+    def test_verify_many_read_ahead(self):
+        """ Case that transactions are taken from the input only a bounded number of chunks ahead of the consumer.
+        """
+        # Given
+        tx = sign_params('icx_sendTransaction', make_unsigned_params(address, f'hx{1:040x}', 10 ** 18, 10 ** 16),
+                         private_key_bytes)
+        consumed = []
+
+        def txs():
+            for i in range(10000):
+                consumed.append(i)
+                yield tx
+
+        # When
+        results = verify_many(txs(), processes=2, chunk_size=4, read_ahead=3)
+        first_result = next(results)
+        time.sleep(0.2)
+        consumed_count = len(consumed)
+        results.close()
+
+        # Then
+        self.assertTrue(first_result)
+        self.assertLessEqual(consumed_count, 4 * (3 + 1) + 1)
+
+    def test_derive_addresses(self):
+        """ Case to derive addresses of keys given as a list and as concatenated bytes.
+        """
+        # Given
+        private_keys = [bytes([i + 1]) * 32 for i in range(40)]
+        expect = [get_address_by_privkey(private_key) for private_key in private_keys]
+
+        # When
+        addresses = list(derive_addresses(private_keys, processes=2, chunk_size=3))
+        compact_addresses = list(derive_addresses(b''.join(private_keys), compact=True, processes=1))
+
+        # Then
+        self.assertEqual(expect, addresses)
+        self.assertEqual(expect, [f'hx{address.hex()}' for address in compact_addresses])
+
+    def test_derive_addresses_read_ahead(self):
+        """ Case that keys are taken from the input only a bounded number of chunks ahead of the consumer.
+        """
+        # Given
+        consumed = []
+
+        def private_keys():
+            for i in range(10000):
+                consumed.append(i)
+                yield (i + 1).to_bytes(32, 'big')
+
+        # When
+        addresses = derive_addresses(private_keys(), processes=2, chunk_size=4, read_ahead=3)
+        first_address = next(addresses)
+        time.sleep(0.2)
+        consumed_count = len(consumed)
+        addresses.close()
+
+        # Then
+        self.assertEqual(get_address_by_privkey((1).to_bytes(32, 'big')), first_address)
+        self.assertLessEqual(consumed_count, 4 * (3 + 1) + 1)
+
+    def test_create_keystore_files(self):
+        """ Case to create keystore files across processes and to list them in the manifest.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            # Given
+            manifest_path = os.path.join(directory, 'manifest.tsv')
+
+            # When
+            results = list(create_keystore_files(directory, 12, 'password1234*', processes=2,
+                                                 kdf_profile=LOW_COST_KDF_PROFILE, manifest_path=manifest_path))
+
+            # Then
+            with open(manifest_path) as manifest:
+                self.assertEqual(results, [tuple(line.rstrip('\n').split('\t')) for line in manifest])
+            self.assertEqual(12, len(set(results)))
+            self.assertEqual(13, len(os.listdir(directory)))
+            address, file_path = results[0]
+            wallet, _ = Wallet.open_keystore_file_of_wallet(file_path, 'password1234*')
+            self.assertEqual(address, wallet.address)
+
+    def test_store_wallet_atomically(self):
+        """ Case that an existing file is kept unless it is overwritten, and no temporary file is left.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            # Given
+            file_path = os.path.join(directory, 'keystore.json')
+            store_wallet_atomically(file_path, b'1')
+
+            # When, Then
+            self.assertRaises(FileExistsError, store_wallet_atomically, file_path, b'2')
+            store_wallet_atomically(file_path, b'3', overwrite=True)
+            with open(file_path, 'rb') as f:
+                self.assertEqual(b'3', f.read())
+            self.assertEqual(['keystore.json'], os.listdir(directory))
+
+    def test_unlock_many(self):
+        """ Case to unlock keystore files and contents across processes with an error for each failure.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            # Given
+            wallets = dict(create_keystore_files(directory, 4, 'password1234*', processes=1,
+                                                 kdf_profile=LOW_COST_KDF_PROFILE))
+            file_paths = list(wallets.values())
+            wallet_info = load_key_store_file(file_paths[0])
+            missing_file_path = os.path.join(directory, 'missing.json')
+            keystores = file_paths + [wallet_info, dict(wallet_info, address=address), missing_file_path,
+                                      os.path.join(TEST_DIR, 'not_a_key_store_file.txt')]
+            passwords = ['password1234*'] * 3 + ['wrong1234*'] + ['password1234*'] * 4
+
+            # When
+            results = list(unlock_many(keystores, passwords, processes=2))
+
+            # Then
+            unlocked = [(address, key) for address, key in results if isinstance(key, bytes)]
+            errors = {address: key.reason for address, key in results if isinstance(key, KeystoreIsNotUnlocked)}
+            self.assertEqual(4, len(unlocked))
+            self.assertTrue(all(get_address_by_privkey(key) == address for address, key in unlocked))
+            self.assertIsInstance(errors[list(wallets)[3]], PasswordIsWrong)
+            self.assertIsInstance(errors[address], AddressIsWrong)
+            self.assertIsInstance(errors[missing_file_path], FilePathIsWrong)
+            self.assertIsInstance(errors[keystores[-1]], NotAKeyStoreFile)
+            self.assertRaises(ValueError, list, unlock_many(keystores, passwords[:-1], processes=1))
+            self.assertRaises(ValueError, list, unlock_many(iter(keystores[:2]), iter(passwords), processes=1))
+
+    def test_reencrypt_keystores(self):
+        """ Case to re-encrypt keystore files across processes and to resume an interrupted run.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            # Given
+            wallets = dict(create_keystore_files(directory, 4, 'password1234*', processes=1,
+                                                 kdf_profile=LOW_COST_KDF_PROFILE))
+            file_paths = sorted(wallets.values())
+            with open(os.path.join(directory, 'readme.txt'), 'w') as f:
+                f.write('not a keystore')
+            kdf_profile = KdfProfile('scrypt', 1024)
+            # The run was interrupted after two files.
+            list(reencrypt_keystores(file_paths[:2], 'password1234*', 'newpassword1234*', kdf_profile, processes=1))
+
+            # When
+            results = dict(reencrypt_keystores(directory, 'password1234*', 'newpassword1234*', kdf_profile,
+                                               processes=2))
+
+            # Then
+            self.assertEqual([ALREADY_REENCRYPTED] * 2 + [REENCRYPTED] * 2, [results[path] for path in file_paths])
+            error = results[os.path.join(directory, 'readme.txt')]
+            self.assertIsInstance(error, KeystoreIsNotReencrypted)
+            self.assertIsInstance(error.reason, NotAKeyStoreFile)
+            unlocked = dict(unlock_many(file_paths, 'newpassword1234*', processes=1))
+            self.assertEqual(set(wallets), set(unlocked))
+            self.assertEqual(kdf_profile, KdfProfile.from_keystore(load_key_store_file(file_paths[0])))
+            self.assertEqual(5, len(os.listdir(directory)))
+
+    def test_reencrypt_main(self):
+        """ Case to re-encrypt a directory with the command line tool.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            # Given
+            file_path, = dict(create_keystore_files(directory, 1, 'password1234*', processes=1,
+                                                    kdf_profile=LOW_COST_KDF_PROFILE)).values()
+
+            # When
+            with mock.patch('getpass.getpass', return_value='password1234*'), mock.patch('sys.stdout'), \
+                    mock.patch('sys.stderr'):
+                exit_code = main([directory, '--cost', '2048', '--processes', '1'])
+
+            # Then
+            self.assertEqual(0, exit_code)
+            self.assertEqual(KdfProfile('pbkdf2', 2048), KdfProfile.from_keystore(load_key_store_file(file_path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
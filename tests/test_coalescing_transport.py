@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from icx.transport import HttpTransport, CoalescingTransport
+from icx.utils import get_last_block, get_balance, create_jsonrpc_request_content, post
+from tests.local_node import LocalNode
+
+address = 'hx66425784bfddb5b430136b38268c3ce1fb68e8c5'
+
+
+def respond(payload):
+    time.sleep(0.1)
+    if payload['method'] == 'icx_getBalance':
+        return {'jsonrpc': '2.0', 'id': payload['id'], 'result': {'response_code': 0, 'response': '0x10'}}
+    return {'jsonrpc': '2.0', 'id': payload['id'], 'result': {'response_code': 0, 'block': {'height': 1}}}
+
+
+class TestCoalescingTransport(unittest.TestCase):
+
+    def test0(self):
+        """ Case that identical concurrent requests share one network call.
+        """
+        # Given
+        with LocalNode(respond) as node, CoalescingTransport(HttpTransport()) as transport, \
+                ThreadPoolExecutor(max_workers=20) as executor:
+
+            # When
+            futures = [executor.submit(get_last_block, node.uri, transport) for _ in range(20)]
+            blocks = [future.result() for future in futures]
+
+        # Then
+        self.assertTrue(all(block['result']['block']['height'] == 1 for block in blocks))
+        self.assertEqual(1, node.request_count)
+
+    def test1(self):
+        """ Case that cached balances are dropped when a transaction is sent from the address.
+        """
+        # Given
+        with LocalNode(respond) as node, CoalescingTransport(HttpTransport(), ttl=60) as transport:
+
+            # When
+            get_balance(address, node.uri, transport)
+            get_balance(address, node.uri, transport)
+            get_last_block(node.uri, transport)
+            count_before_transfer = node.request_count
+
+            payload = create_jsonrpc_request_content(0, 'icx_sendTransaction', {'from': address})
+            post(f'{node.uri}v2', payload, transport)
+            get_balance(address, node.uri, transport)
+            get_last_block(node.uri, transport)
+
+        # Then
+        self.assertEqual(2, count_before_transfer)
+        self.assertEqual(5, node.request_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import codecs
+import os
+import tempfile
+import unittest
+from icx.codec import StdlibJsonCodec, get_codec, set_codec, dumps, loads
+from icx.utils import read_wallet
+
+TEST_DIR = os.path.dirname(os.path.abspath("tests/keystore_file/not_a_key_store_file.txt"))
+
+
+class TestCodec(unittest.TestCase):
+
+    def test0(self):
+        """ Case to encode and decode with the codec in use.
+        """
+        # Given
+        content = {'jsonrpc': '2.0', 'method': 'icx_getBalance', 'id': 0, 'params': {'memo': 'ü ✓'},
+                   'big': 2 ** 80 + 1, 'amount': [2 ** 64, -2 ** 63 - 1, 10 ** 18, 2 ** 64 - 1, -2 ** 63],
+                   'hash': '0x1234567890123456789012345678901234567890', 'list': [-9223372036854775809]}
+
+        # When
+        data = dumps(content)
+
+        # Then
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(content, loads(data))
+        self.assertEqual(content, loads(data.decode('utf-8')))
+
+    def test1(self):
+        """ Case to replace the codec.
+        """
+        # Given
+        codec = get_codec()
+
+        try:
+            # When
+            set_codec(StdlibJsonCodec())
+
+            # Then
+            self.assertEqual('json', get_codec().name)
+            self.assertEqual({'a': [1, 2]}, loads(dumps({'a': [1, 2]})))
+        finally:
+            set_codec(codec)
+
+    def test2(self):
+        """ Case to read a keystore file starting with BOM.
+        """
+        # Given
+        keystore_file_path = os.path.join(TEST_DIR, "test_keystore_for_transfer.txt")
+        with open(keystore_file_path, 'rb') as f:
+            content = f.read()
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'keystore.txt')
+            with open(file_path, 'wb') as f:
+                f.write(codecs.BOM_UTF8 + content)
+
+            # When
+            wallet_info = read_wallet(file_path)
+
+        # Then
+        self.assertEqual(read_wallet(keystore_file_path), wallet_info)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from icx import crypto
+from icx.crypto import get_available_backends, get_backend, set_backend, benchmark
+from icx.signer import IcxSigner, recover_public_key
+
+private_key_bytes = bytes.fromhex("df7784bc856bc3e96d5b2733957ea0a47ff39d60aaf8a3406a74b8580e8395cc")
+msg_hash = bytes.fromhex("1257b9ea76e716b145463f0350f534f973399898a18a50d391e7d2815e72c950")
+
+
+class TestCrypto(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = get_backend()
+
+    def tearDown(self):
+        set_backend(self.backend)
+
+    def test0(self):
+        """ Case that every backend makes the same keys and signatures, and recovers the public key.
+        """
+        # Given
+        backends = get_available_backends()
+        results = []
+
+        for backend in backends.values():
+            # When
+            set_backend(backend)
+            signer = IcxSigner.from_bytes(private_key_bytes)
+            signature_bytes, recovery_id = signer.sign_recoverable(msg_hash)
+            results.append((signer.public_key_bytes, signer.sign(msg_hash), signature_bytes, recovery_id))
+
+            # Then
+            self.assertEqual(signer.public_key_bytes,
+                             recover_public_key(msg_hash, signature_bytes + bytes([recovery_id])))
+            self.assertEqual("hx66425784bfddb5b430136b38268c3ce1fb68e8c5", f'hx{signer.address.hex()}')
+
+        self.assertIn('python', backends)
+        self.assertEqual(1, len(set(results)))
+
+    def test1(self):
+        """ Case that the backend is chosen by name.
+        """
+        # When
+        set_backend('python')
+
+        # Then
+        self.assertEqual('python', get_backend().name)
+        self.assertEqual('python', crypto.select_backend('python').name)
+        self.assertRaises(ValueError, set_backend, 'unknown')
+
+    def test2(self):
+        """ Case that the benchmark measures every given backend.
+        """
+        # Given
+        backends = list(get_available_backends().values())
+
+        # When
+        results = benchmark(backends, iterations=2)
+
+        # Then
+        self.assertEqual({backend.name for backend in backends}, set(results))
+        self.assertTrue(all(operations > 0 for operations in results.values()))
+
+    def test3(self):
+        """ Case that a private key out of the range of the curve is rejected.
+        """
+        # Then
+        self.assertRaises(ValueError, IcxSigner.from_bytes, bytes(32))
+        self.assertRaises(TypeError, IcxSigner.from_bytes, bytes(31))
+
+    def test4(self):
+        """ Case that every backend raises ValueError for an invalid signature.
+        """
+        for backend in get_available_backends().values():
+            # When
+            set_backend(backend)
+
+            # Then
+            self.assertRaises(ValueError, recover_public_key, msg_hash, bytes(65))
+            self.assertRaises(ValueError, recover_public_key, msg_hash, b'\xff' * 64 + b'\x01')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import time
+import unittest
+from icx.transport import HttpTransport
+from icx.wallet import Wallet
+from tests.local_node import LocalNode
+
+
+def respond(payload):
+    # Delay randomly so that the replies arrive out of order.
+    time.sleep(random.random() * 0.01)
+    return {'jsonrpc': '2.0', 'id': payload['id'],
+            'result': {'response_code': 0, 'block': {'height': payload['params']['height']}}}
+
+
+class TestGetBlocks(unittest.TestCase):
+
+    def test0(self):
+        """ Case to get blocks concurrently in the order of height.
+        """
+        # Given
+        with LocalNode(respond) as node, HttpTransport() as transport:
+            # When
+            blocks = Wallet.get_blocks(5, 45, workers=8, uri=node.uri, transport=transport)
+            heights = [block['result']['block']['height'] for block in blocks]
+
+        # Then
+        self.assertEqual(list(range(5, 45)), heights)
+
+    def test1(self):
+        """ Case that only the read ahead window is requested when the caller stops early.
+        """
+        # Given
+        with LocalNode(respond) as node, HttpTransport() as transport:
+            blocks = Wallet.get_blocks(0, 1000, workers=2, read_ahead=4, uri=node.uri, transport=transport)
+
+            # When
+            first_block = next(blocks)
+            blocks.close()
+
+        # Then
+        self.assertEqual(0, first_block['result']['block']['height'])
+        self.assertLessEqual(node.request_count, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
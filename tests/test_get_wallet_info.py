@@ -17,14 +17,20 @@
 
 import os
 import unittest
+from icx.kdf import KdfProfile, LOW_COST_KDF_PROFILE
 from icx.wallet import Wallet
 from icx.utils import validate_wallet_info
+from tests.local_node import LocalNode
 
 TEST_DIR = os.path.dirname(os.path.abspath("tests/keystore_file/not_a_key_store_file.txt"))
 
 uri = 'https://testwallet.icon.foundation/api/'
 
 
+def respond(payload):
+    return {'jsonrpc': '2.0', 'id': payload['id'], 'result': {'response_code': 0, 'response': hex(10 ** 18)}}
+
+
 class TestGetWalletInfo(unittest.TestCase):
 
     def test0(self):
@@ -115,6 +121,26 @@ class TestGetWalletInfo(unittest.TestCase):
         except FileNotFoundError:
             self.assertFalse(True)
 
+    def test5(self):
+        """ Case that the wallet information of every kdf is in the correct form.
+        """
+        for kdf_profile in (LOW_COST_KDF_PROFILE, KdfProfile('scrypt', 1024)):
+            # Given
+            wallet, _ = Wallet.create_wallet_by_private_key("Adas21312**", kdf_profile=kdf_profile)
+
+            with LocalNode(respond) as node:
+                # When
+                wallet_info = wallet.get_wallet_info(node.uri)
+
+            # Then
+            self.assertTrue(validate_wallet_info(wallet_info))
+
+            # When
+            wallet_info["crypto"]["kdf"] = "unknown"
+
+            # Then
+            self.assertFalse(validate_wallet_info(wallet_info))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import unittest
+from icx.kdf import KdfProfile, LOW_COST_KDF_PROFILE, DEFAULT_KDF_PROFILE
+from icx.utils import make_key_store_content
+from icx.wallet import Wallet
+
+TEST_DIR = os.path.dirname(os.path.abspath("tests/keystore_file/test_keystore.txt"))
+password = "Adas21312**"
+
+
+class TestKdfProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.file_path = os.path.join(TEST_DIR, "test_kdf_keystore.txt")
+        if os.path.isfile(self.file_path):
+            os.remove(self.file_path)
+
+    def tearDown(self):
+        if os.path.isfile(self.file_path):
+            os.remove(self.file_path)
+
+    def test0(self):
+        """ Case that keystore files of every kdf are opened.
+        """
+        for kdf_profile in (LOW_COST_KDF_PROFILE, KdfProfile('scrypt', 1024)):
+            # Given
+            wallet1, private_key = Wallet.create_keystore_file_of_wallet(self.file_path, password, kdf_profile)
+
+            # When
+            wallet2, private_key2 = Wallet.open_keystore_file_of_wallet(self.file_path, password)
+            os.remove(self.file_path)
+
+            # Then
+            self.assertEqual(wallet1.address, wallet2.address)
+            self.assertEqual(private_key, private_key2)
+            self.assertEqual(kdf_profile, KdfProfile.from_keystore(wallet2.wallet_info))
+
+    def test1(self):
+        """ Case that the default profile is used when no profile is given.
+        """
+        # When
+        wallet, _ = Wallet.create_wallet_by_private_key(password, kdf_profile=LOW_COST_KDF_PROFILE)
+        key_store_contents = make_key_store_content(password)
+
+        # Then
+        self.assertEqual(LOW_COST_KDF_PROFILE, KdfProfile.from_keystore(wallet.wallet_info))
+        self.assertEqual(DEFAULT_KDF_PROFILE, KdfProfile.from_keystore(key_store_contents))
+
+    def test2(self):
+        """ Case of invalid profiles.
+        """
+        # Then
+        self.assertRaises(ValueError, KdfProfile, 'md5', 1024)
+        self.assertRaises(ValueError, KdfProfile, 'pbkdf2', 0)
+        self.assertRaises(ValueError, KdfProfile, 'scrypt', 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+from icx.bulk import create_keystore_files
+from icx.kdf import LOW_COST_KDF_PROFILE
+from icx.keystore import KeystoreDirectory
+
+
+class TestKeystoreDirectory(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.temp_dir.name
+        self.wallets = dict(create_keystore_files(self.directory, 5, 'password1234*', processes=1,
+                                                  kdf_profile=LOW_COST_KDF_PROFILE))
+        with open(os.path.join(self.directory, 'readme.txt'), 'w') as f:
+            f.write('not a keystore')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test0(self):
+        """ Case that the persisted index finds files without reading the directory again.
+        """
+        # Given
+        with KeystoreDirectory(self.directory) as keystore_directory:
+            parsed_count = keystore_directory.refresh()
+
+        # When
+        with KeystoreDirectory(self.directory) as keystore_directory:
+            file_paths = {address: keystore_directory.get_file_path(address, refresh=False)
+                          for address in self.wallets}
+            addresses = keystore_directory.get_addresses()
+            parsed_count_again = keystore_directory.refresh()
+
+        # Then
+        self.assertEqual(6, parsed_count)
+        self.assertEqual(self.wallets, file_paths)
+        self.assertEqual(sorted(self.wallets), addresses)
+        self.assertEqual(0, parsed_count_again)
+
+    def test1(self):
+        """ Case that the index follows files added, replaced and removed.
+        """
+        # Given
+        keystore_directory = KeystoreDirectory(self.directory)
+        keystore_directory.refresh()
+        removed, replaced = list(self.wallets)[:2]
+        os.remove(self.wallets[removed])
+        os.replace(self.wallets[replaced], os.path.join(self.directory, 'moved.json'))
+        added = dict(create_keystore_files(self.directory, 1, 'password1234*', processes=1,
+                                           kdf_profile=LOW_COST_KDF_PROFILE))
+
+        # When
+        parsed_count = keystore_directory.refresh()
+
+        # Then
+        self.assertEqual(2, parsed_count)
+        self.assertIsNone(keystore_directory.get_file_path(removed))
+        self.assertNotIn(removed, keystore_directory)
+        self.assertEqual(os.path.join(self.directory, 'moved.json'), keystore_directory.get_file_path(replaced))
+        self.assertEqual(list(added.values()), [keystore_directory.get_file_path(address) for address in added])
+        self.assertEqual(5, len(keystore_directory))
+        keystore_directory.close()
+
+    def test2(self):
+        """ Case that a lookup doesn't read the directory and parses a changed file again on its own.
+        """
+        # Given
+        keystore_directory = KeystoreDirectory(self.directory)
+        keystore_directory.refresh()
+        address1, address2 = list(self.wallets)[:2]
+        with open(self.wallets[address2], 'rb') as f:
+            content = f.read()
+        with open(self.wallets[address1], 'wb') as f:
+            f.write(content + b'\n')
+
+        with mock.patch('os.scandir') as scandir:
+            # When
+            missing = keystore_directory.get_file_path('hx' + '0' * 40)
+            file_path1 = keystore_directory.get_file_path(address1)
+            file_path2 = keystore_directory.get_file_path(address2)
+
+        # Then
+        scandir.assert_not_called()
+        self.assertIsNone(missing)
+        self.assertIsNone(file_path1)
+        self.assertIn(file_path2, (self.wallets[address1], self.wallets[address2]))
+        self.assertNotIn(address1, keystore_directory.get_addresses())
+        keystore_directory.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import socket
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from icx.transport import NodePoolTransport
+from icx.utils import get_last_block
+from tests.local_node import LocalNode
+
+uri = 'https://testwallet.icon.foundation/api/'
+
+
+def respond(payload):
+    return {'jsonrpc': '2.0', 'id': payload['id'], 'result': {'response_code': 0, 'block': {'height': 1}}}
+
+
+def respond_slowly(payload):
+    time.sleep(0.05)
+    return respond(payload)
+
+
+def respond_very_slowly(payload):
+    time.sleep(1)
+    return respond(payload)
+
+
+def get_unused_uri():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return f'http://127.0.0.1:{sock.getsockname()[1]}'
+
+
+class TestNodePool(unittest.TestCase):
+
+    def test0(self):
+        """ Case that most requests go to the faster node.
+        """
+        # Given
+        with LocalNode(respond_slowly) as slow_node, LocalNode(respond) as fast_node, \
+                NodePoolTransport([slow_node.uri, fast_node.uri]) as transport:
+
+            # When
+            for _ in range(20):
+                get_last_block(uri, transport)
+
+        # Then
+        self.assertEqual(20, slow_node.request_count + fast_node.request_count)
+        self.assertGreater(fast_node.request_count, 15)
+
+    def test1(self):
+        """ Case to fail over to the live node when a node is down.
+        """
+        # Given
+        with LocalNode(respond) as node, NodePoolTransport([get_unused_uri(), node.uri]) as transport:
+
+            # When
+            blocks = [get_last_block(uri, transport) for _ in range(3)]
+            dead_node, live_node = transport.nodes
+
+        # Then
+        self.assertTrue(all(block['result']['block']['height'] == 1 for block in blocks))
+        self.assertEqual(3, node.request_count)
+        self.assertGreater(dead_node.error_rate, 0)
+        self.assertEqual(0, live_node.error_rate)
+
+    def test2(self):
+        """ Case that a read request to a straggling node is hedged to the other node.
+        """
+        # Given
+        with LocalNode(respond_very_slowly) as slow_node, LocalNode(respond) as fast_node, \
+                NodePoolTransport([slow_node.uri, fast_node.uri], hedge_delay=0.05) as transport:
+
+            # When
+            start = time.monotonic()
+            block = get_last_block(uri, transport)
+            elapsed = time.monotonic() - start
+
+        # Then
+        self.assertEqual(1, block['result']['block']['height'])
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(1, fast_node.request_count)
+
+    def test3(self):
+        """ Case that the hedge delay follows the percentile of the recent latencies.
+        """
+        # Given
+        transport = NodePoolTransport(['http://127.0.0.1:1', 'http://127.0.0.1:2'], hedge_delay=1.0,
+                                      hedge_percentile=90, min_hedge_samples=10)
+        node = transport.nodes[0]
+
+        # When
+        delay_before_samples = transport.get_hedge_delay(node)
+        for i in range(1, 11):
+            node.record_success(i / 100)
+        delay_after_samples = transport.get_hedge_delay(node)
+        transport.close()
+
+        # Then
+        self.assertEqual(1.0, delay_before_samples)
+        self.assertAlmostEqual(0.09, delay_after_samples)
+        self.assertRaises(ValueError, NodePoolTransport, ['http://127.0.0.1:1'], hedge_percentile=90)
+
+    def test4(self):
+        """ Case that concurrent reads aren't limited by the hedge workers nor hedged while they wait for them.
+        """
+        # Given
+        with LocalNode(respond_slowly) as node1, LocalNode(respond_slowly) as node2, \
+                NodePoolTransport([node1.uri, node2.uri], hedge_delay=0.5, hedge_workers=1) as transport, \
+                ThreadPoolExecutor(max_workers=8) as executor:
+
+            # When
+            start = time.monotonic()
+            blocks = list(executor.map(lambda _: get_last_block(uri, transport), range(8)))
+            elapsed = time.monotonic() - start
+
+        # Then
+        self.assertTrue(all(block['result']['block']['height'] == 1 for block in blocks))
+        self.assertEqual(8, node1.request_count + node2.request_count)
+        self.assertLess(elapsed, 0.4)
+
+if __name__ == "__main__":
+    unittest.main()
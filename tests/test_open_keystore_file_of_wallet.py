@@ -17,8 +17,11 @@
 
 import unittest
 import os
+import tempfile
+from unittest import mock
 from icx.wallet import Wallet
-from icx.custom_error import FilePathIsWrong, PasswordIsWrong
+from icx.custom_error import FilePathIsWrong, PasswordIsWrong, NotAKeyStoreFile
+from icx.kdf import LOW_COST_KDF_PROFILE
 
 TEST_DIR = os.path.dirname(os.path.abspath("tests/keystore_file/not_a_key_store_file.txt"))
 
@@ -87,6 +90,34 @@ class TestOpenKeystoreFileOfWallet(unittest.TestCase):
         # Then
         self.assertTrue(type(wallet.wallet_info) == dict)
 
+    def test4(self):
+        """ Case that the keystore file is opened only once.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            # Given
+            password = "Adas21312**"
+            keystore_file_path = os.path.join(directory, "test_keystore.txt")
+            wallet1, private_key = Wallet.create_keystore_file_of_wallet(keystore_file_path, password,
+                                                                          LOW_COST_KDF_PROFILE)
+
+            # When
+            with mock.patch('builtins.open', wraps=open) as opened:
+                wallet2, private_key2 = Wallet.open_keystore_file_of_wallet(keystore_file_path, password)
+
+            # Then
+            self.assertEqual(1, opened.call_count)
+            self.assertEqual((wallet1.wallet_info, private_key), (wallet2.wallet_info, private_key2))
+
+    def test5(self):
+        """ Case to enter a file which isn't a keystore file.
+        """
+        # Given
+        password = "Adas21312**"
+        keystore_file_path = os.path.join(TEST_DIR, "not_a_key_store_file.txt")
+
+        # When, Then
+        self.assertRaises(NotAKeyStoreFile, Wallet.open_keystore_file_of_wallet, keystore_file_path, password)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from icx.signer import IcxSigner, get_signer, clear_signer_cache
+from icx.utils import get_address_by_privkey
+
+private_key_bytes = bytes.fromhex("df7784bc856bc3e96d5b2733957ea0a47ff39d60aaf8a3406a74b8580e8395cc")
+
+
+class TestSigner(unittest.TestCase):
+
+    def test0(self):
+        """ Case that the signer of a private key is reused until the cache is cleared.
+        """
+        # Given, When
+        signer1 = get_signer(private_key_bytes)
+        signer2 = get_signer(private_key_bytes)
+        clear_signer_cache()
+        signer3 = get_signer(private_key_bytes)
+
+        # Then
+        self.assertIs(signer1, signer2)
+        self.assertIsNot(signer1, signer3)
+
+    def test1(self):
+        """ Case that the cached address follows the private key.
+        """
+        # Given
+        signer = IcxSigner()
+        address_before = signer.address
+
+        # When
+        signer.private_key = private_key_bytes
+
+        # Then
+        self.assertNotEqual(address_before, signer.address)
+        self.assertEqual("hx66425784bfddb5b430136b38268c3ce1fb68e8c5", f'hx{signer.address.hex()}')
+        self.assertEqual("hx66425784bfddb5b430136b38268c3ce1fb68e8c5", get_address_by_privkey(private_key_bytes))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+from icx.stream import JsonStream
+from icx.transport import HttpTransport
+from icx.wallet import Wallet
+from tests.local_node import LocalNode
+
+
+def make_block(height):
+    transactions = [{'from': 'hx' + '0' * 40, 'value': hex(i), 'tx_hash': f'{i:064x}', 'memo': 'ü ✓ "quoted"'}
+                    for i in range(1000)]
+    block = {'version': '0.1a', 'prev_block_hash': 'ab' * 32, 'time_stamp': 1528853458925186,
+             'confirmed_transaction_list': transactions, 'block_hash': 'cd' * 32, 'height': height}
+    return {'jsonrpc': '2.0', 'id': 0, 'result': {'response_code': 0, 'block': block}}
+
+
+def respond(payload):
+    if payload['params']['height'] < 0:
+        return {'jsonrpc': '2.0', 'id': 0, 'result': {'response_code': -1, 'message': 'fail wrong block height'}}
+    return make_block(payload['params']['height'])
+
+
+class TestStreamBlock(unittest.TestCase):
+
+    def test0(self):
+        """ Case to stream the transactions of a block with the header fields.
+        """
+        # Given
+        with LocalNode(respond) as node, HttpTransport() as transport:
+
+            # When
+            with Wallet.stream_block_by_height(10, node.uri, transport) as block:
+                header_before = dict(block.header)
+                transactions = list(block)
+                header_after = dict(block.header)
+
+        # Then
+        expect = make_block(10)['result']['block']
+        self.assertEqual(0, block.response_code)
+        self.assertEqual(expect['confirmed_transaction_list'], transactions)
+        self.assertEqual(expect['prev_block_hash'], header_before['prev_block_hash'])
+        self.assertNotIn('height', header_before)
+        self.assertEqual(10, header_after['height'])
+
+    def test1(self):
+        """ Case of the response without a block.
+        """
+        # Given
+        with LocalNode(respond) as node, HttpTransport() as transport:
+
+            # When
+            with Wallet.stream_block_by_height(-1, node.uri, transport) as block:
+                transactions = list(block)
+
+        # Then
+        self.assertEqual(-1, block.response_code)
+        self.assertEqual([], transactions)
+
+    def test2(self):
+        """ Case that values split between tiny chunks are parsed.
+        """
+        # Given
+        content = json.dumps({'a': [1234567, -1.5e10, True, None, {'b': 'ü✓'}], 'c': 98765}).encode()
+        chunks = [content[i:i + 1] for i in range(len(content))]
+
+        # When
+        stream = JsonStream(chunks)
+        keys, values = [], []
+        for key in stream.iter_object_keys():
+            keys.append(key)
+            values.append(list(stream.iter_array()) if key == 'a' else stream.read_value())
+
+        # Then
+        self.assertEqual(['a', 'c'], keys)
+        self.assertEqual([[1234567, -1.5e10, True, None, {'b': 'ü✓'}], 98765], values)
+
+
+if __name__ == "__main__":
+    unittest.main()
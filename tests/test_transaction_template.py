@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from icx.transaction import TransactionTemplate
+from icx.utils import make_unsigned_params, sign_params, get_tx_hash
+
+private_key_bytes = bytes.fromhex("df7784bc856bc3e96d5b2733957ea0a47ff39d60aaf8a3406a74b8580e8395cc")
+address = "hx66425784bfddb5b430136b38268c3ce1fb68e8c5"
+
+
+class TestTransactionTemplate(unittest.TestCase):
+
+    def test0(self):
+        """ Case that the template makes the same params as make_params.
+        """
+        # Given
+        template = TransactionTemplate(address, private_key_bytes)
+
+        for i in range(10):
+            # When
+            params = template.make_params(f'hx{i:040x}', 10 ** 18 * i + 1, 1530000000000000 + i)
+
+            # Then
+            unsigned_params = make_unsigned_params(address, f'hx{i:040x}', 10 ** 18 * i + 1, 10 ** 16,
+                                                   1530000000000000 + i)
+            self.assertEqual(sign_params('icx_sendTransaction', unsigned_params, private_key_bytes), params)
+
+    def test1(self):
+        """ Case that the hash of the template is the same as get_tx_hash with another fee.
+        """
+        # Given
+        template = TransactionTemplate(address, private_key_bytes, fee=12345)
+        params = make_unsigned_params(address, f'hx{1:040x}', 100, 12345)
+
+        # When, Then
+        self.assertEqual(get_tx_hash('icx_sendTransaction', params), template.get_tx_hash(params))
+
+
+if __name__ == "__main__":
+    unittest.main()
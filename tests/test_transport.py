@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import socket
+import unittest
+from icx.custom_error import CircuitIsOpen
+from icx.transport import HttpTransport, RetryPolicy, get_default_transport
+from icx.utils import get_balance, get_last_block
+from tests.local_node import LocalNode
+
+
+def respond(payload):
+    if payload['method'] == 'icx_getBalance':
+        return {'jsonrpc': '2.0', 'id': payload['id'], 'result': {'response_code': 0, 'response': '0x10'}}
+    return {'jsonrpc': '2.0', 'id': payload['id'], 'result': {'response_code': 0, 'block': {'height': 1}}}
+
+
+class TestTransport(unittest.TestCase):
+
+    def test0(self):
+        """ Case that calls without a transport share the default transport.
+        """
+        # Given, When
+        transport1 = get_default_transport()
+        transport2 = get_default_transport()
+
+        # Then
+        self.assertIs(transport1, transport2)
+
+    def test1(self):
+        """ Case that consecutive requests reuse one connection.
+        """
+        # Given
+        with LocalNode(respond) as node, HttpTransport(pool_maxsize=2) as transport:
+
+            # When
+            balances = [get_balance('hx66425784bfddb5b430136b38268c3ce1fb68e8c5', node.uri, transport)
+                        for _ in range(5)]
+            last_block = get_last_block(node.uri, transport)
+
+        # Then
+        self.assertEqual([16] * 5, balances)
+        self.assertEqual(1, last_block['result']['block']['height'])
+        self.assertEqual(6, node.request_count)
+        self.assertEqual(1, node.connection_count)
+
+    def test2(self):
+        """ Case that the same payload is sent again after the node is temporarily unavailable.
+        """
+        # Given
+        payloads = []
+
+        def respond_after_failures(payload):
+            payloads.append(payload)
+            if len(payloads) < 3:
+                return 503, {}
+            return respond(payload)
+
+        retry_policy = RetryPolicy(max_retries=2, backoff_factor=0.01)
+        with LocalNode(respond_after_failures) as node, HttpTransport(retry_policy=retry_policy) as transport:
+
+            # When
+            balance = get_balance('hx66425784bfddb5b430136b38268c3ce1fb68e8c5', node.uri, transport)
+
+        # Then
+        self.assertEqual(16, balance)
+        self.assertEqual(3, len(payloads))
+        self.assertTrue(payloads[0] == payloads[1] == payloads[2])
+
+    def test3(self):
+        """ Case that requests fail fast once the circuit of the node is open.
+        """
+        # Given
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            uri = f'http://127.0.0.1:{sock.getsockname()[1]}/api/'
+        retry_policy = RetryPolicy(max_retries=0)
+        transport = HttpTransport(retry_policy=retry_policy, failure_threshold=2, reset_timeout=60)
+
+        # When
+        for _ in range(2):
+            with self.assertRaises(Exception) as context:
+                get_last_block(uri, transport)
+            self.assertNotIsInstance(context.exception, CircuitIsOpen)
+
+        # Then
+        self.assertRaises(CircuitIsOpen, get_last_block, uri, transport)
+        self.assertTrue(transport.get_circuit_breaker(uri).is_open)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 theloop Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+import time
+import unittest
+import weakref
+from unittest import mock
+from icx.custom_error import PasswordIsWrong
+from icx.signer import get_signer, clear_signer_cache
+from icx.utils import verify
+from icx.wallet import Wallet
+from icx.wallet import wallet as wallet_module
+from tests.local_node import LocalNode
+
+password = 'password1234*'
+to_address = 'hxa974f512a510299b53c55535c105ed962fd01ee2'
+transactions = []
+
+
+def respond(payload):
+    if payload['method'] == 'icx_getBalance':
+        return {'jsonrpc': '2.0', 'id': payload['id'], 'result': {'response_code': 0, 'response': hex(10 ** 20)}}
+    transactions.append(payload['params'])
+    return {'jsonrpc': '2.0', 'id': payload['id'], 'result': {'response_code': 0, 'tx_hash': payload['params']['tx_hash']}}
+
+
+class TestUnlockWallet(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.wallet, _ = Wallet.create_wallet_by_private_key(
+            password, "df7784bc856bc3e96d5b2733957ea0a47ff39d60aaf8a3406a74b8580e8395cc")
+
+    def tearDown(self):
+        self.wallet.lock()
+        transactions.clear()
+
+    def test0(self):
+        """ Case that transfers of an unlocked wallet skip the key derivation.
+        """
+        # Given
+        self.wallet.unlock(password, ttl=60)
+
+        with LocalNode(respond) as node, \
+                mock.patch.object(wallet_module, 'decode_keyfile_json') as decode_keyfile_json:
+            # When
+            for _ in range(3):
+                self.wallet.transfer_value(None, to_address, 10 ** 18, uri=node.uri)
+
+        # Then
+        decode_keyfile_json.assert_not_called()
+        self.assertEqual(3, len(transactions))
+        self.assertTrue(all(verify(params) for params in transactions))
+
+    def test1(self):
+        """ Case that the private key is wiped when the time is over or the wallet is locked.
+        """
+        # When
+        self.wallet.unlock(password, ttl=0.1)
+        is_unlocked = self.wallet.is_unlocked
+        private_key = self.wallet._Wallet__unlocked_key
+        time.sleep(0.2)
+
+        # Then
+        self.assertTrue(is_unlocked)
+        self.assertFalse(self.wallet.is_unlocked)
+        self.assertEqual(bytes(32), private_key)
+
+        # When
+        self.wallet.unlock(password, ttl=60)
+        private_key = self.wallet._Wallet__unlocked_key
+        self.wallet.lock()
+
+        # Then
+        self.assertFalse(self.wallet.is_unlocked)
+        self.assertEqual(bytes(32), private_key)
+
+    def test2(self):
+        """ Case to unlock with a wrong password.
+        """
+        # Then
+        self.assertRaises(PasswordIsWrong, self.wallet.unlock, 'wrong1234*')
+        self.assertFalse(self.wallet.is_unlocked)
+
+    def test3(self):
+        """ Case that no signer keeps the private key after lock() or the expiry.
+        """
+        with LocalNode(respond) as node:
+            for ttl, wait in ((60, self.wallet.lock), (0.1, lambda: time.sleep(0.2))):
+                # Given
+                clear_signer_cache()
+                self.wallet.unlock(password, ttl=ttl)
+                self.wallet.transfer_value(None, to_address, 10 ** 18, uri=node.uri)
+
+                # When
+                wait()
+
+                # Then
+                self.assertFalse(self.wallet.is_unlocked)
+                self.assertEqual(0, get_signer.cache_info().currsize)
+
+    def test4(self):
+        """ Case that a transfer with the password doesn't leave the private key in the cache of signers.
+        """
+        # Given
+        clear_signer_cache()
+
+        with LocalNode(respond) as node:
+            # When
+            self.wallet.transfer_value(password, to_address, 10 ** 18, uri=node.uri)
+
+        # Then
+        self.assertEqual(0, get_signer.cache_info().currsize)
+        self.assertTrue(verify(transactions[0]))
+
+    def test5(self):
+        """ Case that an unlocked wallet is collected before the time is over and its private key is wiped.
+        """
+        # Given
+        wallet, _ = Wallet.create_wallet_by_private_key(
+            password, "df7784bc856bc3e96d5b2733957ea0a47ff39d60aaf8a3406a74b8580e8395cc")
+        wallet.unlock(password, ttl=60)
+        wallet_ref = weakref.ref(wallet)
+        private_key = wallet._Wallet__unlocked_key
+
+        # When
+        del wallet
+        gc.collect()
+
+        # Then
+        self.assertIsNone(wallet_ref())
+        self.assertEqual(bytes(32), private_key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,7 +17,7 @@
 
 import unittest
 import os
-from icx.utils import get_tx_hash, sign
+from icx.utils import get_tx_hash, get_tx_phrase, sha3_256, sign
 
 TEST_DIR = os.path.dirname(os.path.abspath("tests/keystore_file/not_a_key_store_file.txt"))
 
@@ -39,6 +39,24 @@ class TestTransferValue(unittest.TestCase):
         # Then
         self.assertEqual(expect, tx_hash)
 
+    def test_get_tx_phrase(self):
+        """ Test for get_tx_phrase function with nested and empty params.
+        """
+        # Given
+        method = "method"
+        params = {"to": "hx1", "data": {"b": {}, "a": {"y": 2, "x": True}}, "empty": {}, "value": "0x1"}
+
+        expect = "method.data.a.x.True.y.2.b.empty.to.hx1.value.0x1"
+
+        # When
+        tx_phrase = get_tx_phrase(method, params)
+
+        # Then
+        self.assertEqual(expect, tx_phrase)
+        self.assertEqual("method", get_tx_phrase(method, {}))
+        self.assertEqual(sha3_256(expect.encode()), get_tx_hash(method, params))
+        self.assertEqual(sha3_256(b"method"), get_tx_hash(method, {}))
+
     def test_sign(self):
         """ Test for sign function.
         """